@@ -4,11 +4,12 @@ AI Assistant for Job Market Analysis
 Uses OpenAI GPT to analyze job market data
 """
 
-import sqlite3
 import json
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
+from database.snapshot import get_read_connection
+from database.search import SNIPPET_SQL, build_match_query
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +39,7 @@ class JobMarketAI:
     
     def get_database_stats(self) -> Dict:
         """Get current database statistics"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = get_read_connection(self.db_path)
         cursor = conn.cursor()
         
         stats = {}
@@ -51,7 +51,7 @@ class JobMarketAI:
         
         # Jobs with descriptions
         stats['jobs_with_jd'] = cursor.execute(
-            "SELECT COUNT(*) FROM jobs WHERE description != '' AND description IS NOT NULL AND is_active = 1"
+            "SELECT COUNT(*) FROM jobs j JOIN job_descriptions d ON d.job_id = j.id WHERE j.is_active = 1"
         ).fetchone()[0]
         
         # Jobs by category
@@ -92,32 +92,34 @@ class JobMarketAI:
         """).fetchall()
         stats['top_companies'] = [dict(row) for row in company_data]
         
-        conn.close()
         return stats
     
     def search_jobs(self, query: str, limit: int = 50) -> List[Dict]:
-        """Search jobs in database"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Search active jobs by title, company and description, best matches first"""
+        match = build_match_query(query)
+        if not match:
+            return []
+        
+        conn = get_read_connection(self.db_path)
         cursor = conn.cursor()
         
-        # Search in title, company, description
-        jobs = cursor.execute("""
-            SELECT id, title, company, location, category, salary_range, 
-                   description, source, created_at
-            FROM jobs 
-            WHERE is_active = 1 
-              AND (title LIKE ? OR company LIKE ? OR description LIKE ?)
-            ORDER BY created_at DESC
+        # FTS5 index ranked by BM25; only the hits' descriptions are decompressed
+        jobs = cursor.execute(f"""
+            SELECT j.id, j.title, j.company, j.location, j.category, j.salary_range, 
+                   t.description, j.source, j.created_at, {SNIPPET_SQL} AS snippet
+            FROM jobs_fts
+            JOIN jobs j ON j.id = jobs_fts.rowid
+            LEFT JOIN job_description_text t ON t.job_id = j.id
+            WHERE jobs_fts MATCH ? AND j.is_active = 1
+            ORDER BY rank
             LIMIT ?
-        """, (f'%{query}%', f'%{query}%', f'%{query}%', limit)).fetchall()
+        """, (match, limit)).fetchall()
         
-        conn.close()
         return [dict(row) for row in jobs]
     
     def analyze_tech_trends(self) -> Dict:
         """Analyze technology trends in job descriptions"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_read_connection(self.db_path)
         cursor = conn.cursor()
         
         # Common tech keywords to search
@@ -133,14 +135,13 @@ class JobMarketAI:
         for tech in tech_keywords:
             count = cursor.execute("""
                 SELECT COUNT(*) 
-                FROM jobs 
-                WHERE description LIKE ? AND is_active = 1
+                FROM jobs j
+                JOIN job_description_text t ON t.job_id = j.id
+                WHERE t.description LIKE ? AND j.is_active = 1
             """, (f'%{tech}%',)).fetchone()[0]
             if count > 0:
                 tech_counts[tech] = count
         
-        conn.close()
-        
         # Sort by count
         sorted_tech = sorted(tech_counts.items(), key=lambda x: x[1], reverse=True)
         return {
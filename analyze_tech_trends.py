@@ -4,11 +4,11 @@
 分析职位描述（JD）中的技术栈、技能要求等
 """
 
-import sqlite3
 import re
 from collections import Counter
 from typing import Dict, List, Tuple
 import logging
+from database.sqlite import get_connection
 
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
@@ -100,19 +100,17 @@ class TechTrendAnalyzer:
     
     def get_jobs_with_descriptions(self) -> List[Dict]:
         """获取所有包含JD的职位"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT id, title, company, description, category, source, created_at
-            FROM jobs
-            WHERE description != '' AND description IS NOT NULL
-            ORDER BY created_at DESC
+            SELECT j.id, j.title, j.company, t.description, j.category, j.source, j.created_at
+            FROM all_jobs j
+            JOIN job_description_text t ON t.job_id = j.id
+            ORDER BY j.created_at DESC
         """)
         
         jobs = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         
         return jobs
     
@@ -9,6 +9,10 @@ class Config:
     
     # Database
     DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///job_scraper.db')
+    ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 30))  # Move inactive jobs to jobs_archive
+    
+    # Shared response cache and data generation counter (optional; fake:// for tests)
+    REDIS_URL = os.getenv('REDIS_URL')
     
     # API Keys
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
@@ -0,0 +1,115 @@
+"""
+Hot/cold archival of inactive jobs.
+
+Jobs that have been inactive for more than ARCHIVE_AFTER_DAYS move from `jobs` to
+`jobs_archive` with their ids unchanged, so their snapshots and descriptions stay
+attached. `jobs` then only holds active and recently closed postings, and queries
+that need the full history read the `all_jobs` view (jobs UNION ALL jobs_archive).
+
+An archived job that shows up in a scrape again is moved back by the ingest
+(restore_jobs) before it is merged, so it keeps its original row.
+
+Usage:
+    python -m database.archive [--days N] [--db PATH]
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_AFTER_DAYS = Config.ARCHIVE_AFTER_DAYS
+
+
+def _job_columns(cursor):
+    cursor.execute("PRAGMA table_info(jobs)")
+    return ', '.join(row[1] for row in cursor.fetchall())
+
+
+def archive_inactive_jobs(conn, days: int = ARCHIVE_AFTER_DAYS) -> int:
+    """
+    Move jobs inactive for more than `days` days into jobs_archive.
+
+    Args:
+        conn: sqlite3 connection without an open transaction
+        days: Minimum days since the job was last seen
+
+    Returns:
+        Number of jobs archived
+    """
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    now = datetime.now().isoformat()
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cursor = conn.cursor()
+        columns = _job_columns(cursor)
+        cursor.execute(f'''
+            INSERT INTO jobs_archive ({columns}, archived_at)
+            SELECT {columns}, ? FROM jobs
+            WHERE is_active = 0 AND last_seen_date < ?
+        ''', (now, cutoff))
+        archived = cursor.rowcount
+        cursor.execute('''
+            DELETE FROM jobs
+            WHERE is_active = 0 AND last_seen_date < ?
+        ''', (cutoff,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    logger.info(f"🧊 Archived {archived} jobs inactive since before {cutoff[:10]}")
+    return archived
+
+
+def restore_jobs(cursor, match_table: str) -> int:
+    """
+    Move archived jobs back into jobs.
+
+    Args:
+        cursor: sqlite3 cursor inside the caller's transaction
+        match_table: Table with external_id and canonical_url columns (e.g. the
+            ingest's incoming_jobs); archived jobs matching either are restored
+
+    Returns:
+        Number of jobs restored
+    """
+    columns = _job_columns(cursor)
+    matches = f'''
+        external_id IN (SELECT external_id FROM {match_table})
+        OR canonical_url IN (SELECT canonical_url FROM {match_table} WHERE canonical_url IS NOT NULL)
+    '''
+    cursor.execute(f'''
+        INSERT OR IGNORE INTO jobs ({columns})
+        SELECT {columns} FROM jobs_archive
+        WHERE {matches}
+    ''')
+    restored = cursor.rowcount
+    # Rows skipped by a unique conflict stay archived
+    cursor.execute(f"DELETE FROM jobs_archive WHERE ({matches}) AND id IN (SELECT id FROM jobs)")
+    if restored:
+        logger.info(f"♻️  Restored {restored} archived jobs")
+    return restored
+
+
+if __name__ == '__main__':
+    import argparse
+    from database.sqlite import connect
+    from database.migrations import migrate
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Archive long-inactive jobs')
+    parser.add_argument('--days', type=int, default=ARCHIVE_AFTER_DAYS,
+                        help=f'Archive jobs inactive for more than N days (default: {ARCHIVE_AFTER_DAYS})')
+    parser.add_argument('--db', default=None, help='Database path (default: project root)')
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    try:
+        migrate(conn)
+        archive_inactive_jobs(conn, args.days)
+    finally:
+        conn.close()
@@ -1,16 +1,112 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+"""
+SQLAlchemy engines and sessions.
+
+Engines are process-wide singletons, one per database URL, each with its own
+connection pool, so callers get warm pooled connections instead of building a new
+engine per query. Sessions are scoped to the calling thread.
+"""
+
+import os
+import threading
+import logging
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, scoped_session
 from config import Config
 
-def get_engine():
-    """Create and return database engine."""
-    return create_engine(Config.DATABASE_URL)
+logger = logging.getLogger(__name__)
+
+# Pool settings for server databases (SQLite uses SQLAlchemy's default file pool)
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))  # seconds
+
+_engines = {}
+_sessions = {}
+# Re-entrant: get_session_factory() creates the engine while holding it
+_lock = threading.RLock()
+
+
+def _create_engine(url):
+    if url.startswith('sqlite'):
+        engine = create_engine(url, pool_pre_ping=True)
+
+        # Same pragmas and functions as the raw sqlite3 connections
+        @event.listens_for(engine, 'connect')
+        def _configure_sqlite(dbapi_conn, _record):
+            from database.sqlite import PRAGMAS
+            from database.descriptions import decompress_text
+            for name, value in PRAGMAS:
+                dbapi_conn.execute(f"PRAGMA {name} = {value}")
+            dbapi_conn.create_function('zlib_decompress', 2, decompress_text, deterministic=True)
+
+        return engine
+
+    return create_engine(
+        url,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_pre_ping=True,         # drop connections the server closed while idle
+        pool_recycle=POOL_RECYCLE,
+    )
+
+
+def get_engine(url=None):
+    """Return the shared engine for a database URL (default: Config.DATABASE_URL)."""
+    url = url or Config.DATABASE_URL
+    engine = _engines.get(url)
+    if engine is None:
+        with _lock:
+            engine = _engines.get(url)
+            if engine is None:
+                engine = _create_engine(url)
+                _engines[url] = engine
+    return engine
+
+
+def get_session_factory(url=None):
+    """Return the thread-scoped session registry bound to the shared engine."""
+    url = url or Config.DATABASE_URL
+    factory = _sessions.get(url)
+    if factory is None:
+        with _lock:
+            factory = _sessions.get(url)
+            if factory is None:
+                factory = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=get_engine(url)))
+                _sessions[url] = factory
+    return factory
+
+
+def get_session(url=None):
+    """Return this thread's session; session.close() hands its connection back to the pool."""
+    return get_session_factory(url)()
+
+
+@contextmanager
+def session_scope(url=None):
+    """Session that commits on success, rolls back on error and is always closed."""
+    session = get_session(url)
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def dispose_engines():
+    """Drop all sessions and close every pooled connection (e.g. after fork or at exit)."""
+    with _lock:
+        for factory in _sessions.values():
+            factory.remove()
+        for engine in _engines.values():
+            engine.dispose()
+        _sessions.clear()
+        _engines.clear()
 
-def get_session():
-    """Create and return database session."""
-    engine = get_engine()
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    return SessionLocal()
 
 def create_tables():
     """Create all tables in the database."""
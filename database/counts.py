@@ -0,0 +1,111 @@
+"""
+Total counts for job listings.
+
+/api/jobs reports how many jobs match its filters. Exact counts are cached per
+filter combination and thrown away as a whole when the data generation changes
+(database/generation.py), so a listing request normally runs only its page query.
+The generation is bumped whenever new data is published to readers: after an
+ingest, but also after enrichment or description fetches change tech tags and
+search matches without a new ingest run.
+
+Free-text searches get an estimate instead: the filtered count scaled by each
+term's document frequency, read from the search index's vocabulary table
+(jobs_fts_vocab). That costs a few index lookups however many jobs match.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Filter combinations remembered per data generation
+CACHE_SIZE = 1024
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class JobCounts:
+    """Exact counts of active-job queries, cached per filter combination and data generation."""
+
+    def __init__(self, generation_fn: Callable[[], int], max_entries: int = CACHE_SIZE):
+        """
+        Args:
+            generation_fn: Returns the current data generation of the database counted
+            max_entries: Filter combinations kept per generation
+        """
+        self.generation_fn = generation_fn
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def exact(self, conn, where_clause: str, params: List, match: Optional[str] = None) -> int:
+        """
+        Number of jobs matching a WHERE clause (and optionally an FTS5 MATCH expression).
+
+        Args:
+            conn: sqlite3 connection
+            where_clause: Conditions on jobs, with ? placeholders
+            params: Values for the placeholders
+            match: Optional jobs_fts MATCH expression
+        """
+        version = self.generation_fn()
+        key = (where_clause, tuple(params), match)
+        with self._lock:
+            if version != self._version:
+                self._cache.clear()
+                self._version = version
+            elif key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        if match:
+            total = conn.execute(f'''
+                SELECT COUNT(*) FROM jobs
+                WHERE {where_clause}
+                  AND id IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)
+            ''', [*params, match]).fetchone()[0]
+        else:
+            total = conn.execute(f"SELECT COUNT(*) FROM jobs WHERE {where_clause}", params).fetchone()[0]
+
+        with self._lock:
+            # A newer generation may have been seen while counting
+            if version == self._version:
+                self._cache[key] = total
+                if len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return total
+
+    def estimate(self, conn, where_clause: str, params: List, terms: List[Tuple[str, bool]]) -> int:
+        """
+        Estimated number of jobs matching the filters and all search terms.
+
+        Terms are treated as independent: the exact filtered count is multiplied by
+        the fraction of indexed jobs containing each term.
+
+        Args:
+            terms: (term, is_prefix) pairs, see database.search.search_terms()
+        """
+        estimate = float(self.exact(conn, where_clause, params))
+        indexed = self.exact(conn, '1', [])
+        if not indexed:
+            return 0
+
+        for term, is_prefix in terms:
+            if is_prefix:
+                # Jobs containing several words with the prefix are counted once per word
+                docs = conn.execute(
+                    'SELECT SUM(doc) FROM jobs_fts_vocab WHERE term >= ? AND term < ?',
+                    (term, _prefix_upper_bound(term))
+                ).fetchone()[0] or 0
+            else:
+                row = conn.execute('SELECT doc FROM jobs_fts_vocab WHERE term = ?', (term,)).fetchone()
+                docs = row[0] if row else 0
+            estimate *= min(docs, indexed) / indexed
+
+        return round(estimate)
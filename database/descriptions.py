@@ -0,0 +1,234 @@
+"""
+Compressed job description storage.
+
+Full descriptions live in `job_descriptions`, one zlib-compressed blob per job, out
+of the hot `jobs` table. `jobs.description_preview` keeps the short text the listings
+show, so list queries never touch the blobs.
+
+Postings share a lot of boilerplate (benefits, equal-opportunity statements, "apply
+now"), so blobs are compressed against a preset dictionary trained on our own corpus
+and stored in `description_dicts`. Each blob records the dictionary it was written
+with, so retraining only affects rows that are recompressed.
+
+Callers that need full text read the `job_description_text` view, which decompresses
+through the zlib_decompress() SQL function registered by database.sqlite.connect().
+
+Usage:
+    python -m database.descriptions stats [db_path]
+    python -m database.descriptions retrain [db_path]
+"""
+
+import re
+import sys
+import zlib
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Listings show this many characters of the description
+PREVIEW_LENGTH = 500
+
+# zlib only looks back 32 KB, so a larger dictionary would be wasted
+DICT_SIZE = 32 * 1024
+
+# Train the first dictionary once this many descriptions are stored
+MIN_TRAINING_SAMPLES = 200
+TRAINING_SAMPLE_SIZE = 2000
+
+COMPRESSION_LEVEL = 9
+
+
+def make_preview(text: Optional[str]) -> str:
+    """Truncated description shown in job listings."""
+    if not text:
+        return ''
+    return text[:PREVIEW_LENGTH] + '...' if len(text) > PREVIEW_LENGTH else text
+
+
+def compress_text(text: str, zdict: Optional[bytes] = None) -> bytes:
+    """zlib-compress a description, optionally against a preset dictionary."""
+    compressor = zlib.compressobj(COMPRESSION_LEVEL, zdict=zdict) if zdict else zlib.compressobj(COMPRESSION_LEVEL)
+    return compressor.compress(text.encode('utf-8')) + compressor.flush()
+
+
+def decompress_text(body: Optional[bytes], zdict: Optional[bytes] = None) -> Optional[str]:
+    """Inverse of compress_text(); also registered as the zlib_decompress() SQL function."""
+    if body is None:
+        return None
+    decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+    return (decompressor.decompress(body) + decompressor.flush()).decode('utf-8')
+
+
+def train_dictionary(samples: Iterable[str], size: int = DICT_SIZE) -> bytes:
+    """
+    Build a zlib preset dictionary from sample descriptions.
+
+    Sentences that recur across postings are the boilerplate worth sharing; they are
+    ranked by how many bytes they would save, with the most valuable placed last
+    (closest to the data, which zlib encodes most cheaply). Common words fill the rest.
+
+    Args:
+        samples: Description texts
+        size: Maximum dictionary size in bytes
+
+    Returns:
+        Dictionary bytes (possibly empty for a tiny corpus)
+    """
+    sentences = Counter()
+    words = Counter()
+    for text in samples:
+        seen = set()
+        for fragment in re.split(r'[\n.!?•]+', text):
+            fragment = ' '.join(fragment.split())
+            if 20 <= len(fragment) <= 300 and fragment not in seen:
+                seen.add(fragment)
+                sentences[fragment] += 1
+        words.update(w for w in re.findall(r'[A-Za-z]{4,}', text))
+
+    ranked = [s for s, count in sorted(sentences.items(), key=lambda kv: kv[1] * len(kv[0]), reverse=True)
+              if count > 1]
+    ranked += [w for w, count in words.most_common() if count > 1]
+
+    chosen = []
+    used = 0
+    for piece in ranked:
+        piece_size = len(piece.encode('utf-8')) + 1
+        if used + piece_size > size:
+            continue
+        chosen.append(piece)
+        used += piece_size
+
+    return '\n'.join(reversed(chosen)).encode('utf-8')
+
+
+def _current_dictionary(cursor) -> Tuple[Optional[int], Optional[bytes]]:
+    """Newest dictionary as (id, zdict), or (None, None) before the first training."""
+    row = cursor.execute(
+        'SELECT id, zdict FROM description_dicts ORDER BY id DESC LIMIT 1'
+    ).fetchone()
+    return (row[0], row[1]) if row else (None, None)
+
+
+def store_descriptions(cursor, rows: List[Tuple[int, str]]) -> int:
+    """
+    Write full descriptions for existing jobs and refresh their previews.
+
+    Args:
+        cursor: sqlite3 cursor (caller commits)
+        rows: (job_id, description) pairs; empty descriptions are skipped
+
+    Returns:
+        Number of descriptions stored
+    """
+    dict_id, zdict = _current_dictionary(cursor)
+
+    blobs = []
+    previews = []
+    for job_id, text in rows:
+        if not text:
+            continue
+        blobs.append((job_id, compress_text(text, zdict), dict_id, len(text)))
+        previews.append((make_preview(text), job_id))
+
+    cursor.executemany('''
+        INSERT INTO job_descriptions (job_id, body, dict_id, raw_length)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(job_id) DO UPDATE SET
+            body = excluded.body,
+            dict_id = excluded.dict_id,
+            raw_length = excluded.raw_length
+    ''', blobs)
+    cursor.executemany('UPDATE jobs SET description_preview = ? WHERE id = ?', previews)
+    return len(blobs)
+
+
+def load_descriptions(conn, job_ids: Iterable[int]) -> Dict[int, str]:
+    """Full descriptions for the given jobs, keyed by job id (jobs without one are omitted)."""
+    job_ids = list(job_ids)
+    if not job_ids:
+        return {}
+    placeholders = ', '.join('?' for _ in job_ids)
+    rows = conn.execute(f'''
+        SELECT job_id, description FROM job_description_text
+        WHERE job_id IN ({placeholders})
+    ''', job_ids).fetchall()
+    return {job_id: description for job_id, description in rows}
+
+
+def retrain_dictionary(cursor, sample_size: int = TRAINING_SAMPLE_SIZE) -> Optional[int]:
+    """
+    Train a new dictionary on the stored corpus and recompress every description with it.
+
+    Returns:
+        New dictionary id, or None if there is nothing to train on
+    """
+    samples = [row[0] for row in cursor.execute('''
+        SELECT description FROM job_description_text
+        ORDER BY job_id DESC LIMIT ?
+    ''', (sample_size,)).fetchall()]
+    zdict = train_dictionary(samples)
+    if not zdict:
+        return None
+
+    cursor.execute(
+        'INSERT INTO description_dicts (zdict, sample_count, created_at) VALUES (?, ?, ?)',
+        (zdict, len(samples), datetime.now().isoformat())
+    )
+    dict_id = cursor.lastrowid
+
+    rows = cursor.execute('SELECT job_id, description FROM job_description_text').fetchall()
+    cursor.executemany(
+        'UPDATE job_descriptions SET body = ?, dict_id = ? WHERE job_id = ?',
+        [(compress_text(text, zdict), dict_id, job_id) for job_id, text in rows]
+    )
+    # Older dictionaries are no longer referenced
+    cursor.execute('DELETE FROM description_dicts WHERE id < ?', (dict_id,))
+    logger.info(f"📚 Trained description dictionary {dict_id} ({len(zdict)} bytes), "
+                f"recompressed {len(rows)} descriptions")
+    return dict_id
+
+
+def maybe_train_dictionary(cursor) -> Optional[int]:
+    """Train the first dictionary once enough descriptions have been collected."""
+    if _current_dictionary(cursor)[0] is not None:
+        return None
+    count = cursor.execute('SELECT COUNT(*) FROM job_descriptions').fetchone()[0]
+    if count < MIN_TRAINING_SAMPLES:
+        return None
+    return retrain_dictionary(cursor)
+
+
+def storage_stats(conn) -> Dict:
+    """Raw vs stored size of the description corpus."""
+    row = conn.execute('''
+        SELECT COUNT(*), COALESCE(SUM(raw_length), 0), COALESCE(SUM(length(body)), 0)
+        FROM job_descriptions
+    ''').fetchone()
+    count, raw, stored = row
+    return {
+        'descriptions': count,
+        'raw_bytes': raw,
+        'stored_bytes': stored,
+        'ratio': round(raw / stored, 2) if stored else None,
+        'dictionary_id': _current_dictionary(conn.cursor())[0],
+    }
+
+
+if __name__ == '__main__':
+    from database.sqlite import connect
+    from database.migrations import migrate
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    conn = connect(sys.argv[2] if len(sys.argv) > 2 else None)
+    try:
+        migrate(conn)
+        if command == 'retrain':
+            retrain_dictionary(conn.cursor())
+            conn.commit()
+        print(storage_stats(conn))
+    finally:
+        conn.close()
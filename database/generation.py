@@ -0,0 +1,97 @@
+"""
+Data generation counter.
+
+A number that goes up every time newly written data becomes visible to readers
+(after each ingest, when the read snapshot is published). Caches key their entries
+on it, so they never need to ask the database whether anything changed.
+
+The counter lives in a small file next to the database, e.g. job_scraper.db ->
+job_scraper.generation. With REDIS_URL set it is also kept in Redis, and read from
+there, so web workers on other hosts see the same value; the file is the fallback
+while Redis is unreachable.
+"""
+
+import os
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from config import Config
+from database.sqlite import DEFAULT_DB_PATH
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = 'job_scraper:data_generation'
+
+
+def generation_path(db_path=None):
+    """Counter file that belongs to a database."""
+    root, _ = os.path.splitext(os.path.abspath(db_path or DEFAULT_DB_PATH))
+    return f"{root}.generation"
+
+
+def _shared_redis():
+    if not Config.REDIS_URL:
+        return None
+    from response_cache import get_redis
+    return get_redis(Config.REDIS_URL)
+
+
+def _read_file(path):
+    try:
+        with open(path) as f:
+            return int(f.read().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+
+def current_generation(db_path=None, redis_client=None) -> int:
+    """
+    Current data generation (0 before the first bump).
+
+    Args:
+        db_path: Database the counter belongs to (file mode)
+        redis_client: Redis client to read from (default: REDIS_URL if set)
+    """
+    redis_client = redis_client or _shared_redis()
+    if redis_client is not None:
+        try:
+            return int(redis_client.get(REDIS_KEY) or 0)
+        except Exception as e:
+            logger.warning(f"Reading the data generation from Redis failed: {e}")
+    return _read_file(generation_path(db_path))
+
+
+def generation_modified_at(db_path=None) -> Optional[datetime]:
+    """When the data generation was last bumped (UTC), or None before the first bump."""
+    try:
+        return datetime.fromtimestamp(os.stat(generation_path(db_path)).st_mtime, tz=timezone.utc)
+    except FileNotFoundError:
+        return None
+
+
+def bump_generation(db_path=None, redis_client=None) -> int:
+    """Advance the data generation and return the new value."""
+    path = generation_path(db_path)
+    generation = _read_file(path) + 1
+
+    redis_client = redis_client or _shared_redis()
+    if redis_client is not None:
+        try:
+            incremented = int(redis_client.incr(REDIS_KEY))
+            if incremented < generation:
+                # The key was lost (restart, eviction); readers must never see a used number again
+                redis_client.set(REDIS_KEY, generation)
+            else:
+                generation = incremented
+        except Exception as e:
+            logger.warning(f"Bumping the data generation in Redis failed: {e}")
+
+    # Written aside and renamed, so readers never see a partial number
+    staging = f"{path}.tmp"
+    with open(staging, 'w') as f:
+        f.write(str(generation))
+    os.replace(staging, path)
+
+    logger.info(f"🔢 Data generation is now {generation}")
+    return generation
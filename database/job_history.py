@@ -0,0 +1,134 @@
+"""
+Delta-encoded job history stored in `job_snapshots`.
+
+When the ingest sees a tracked field change on an existing job, it writes one
+snapshot row holding only the changed fields (`field_changes` = {field: [old, new]}).
+Every KEYFRAME_INTERVAL changes (and on a job's first change) the row also carries
+the full tracked state in `snapshot_data`, so rebuilding a past version never has to
+replay more than KEYFRAME_INTERVAL deltas.
+"""
+
+import json
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fields whose changes are recorded; description bodies are tracked by their hash
+# (URLs are not tracked: tracking parameters change on every scrape)
+TRACKED_FIELDS = ('title', 'company', 'location', 'salary_range', 'job_type', 'description_hash')
+
+# Write a full keyframe after this many delta-only snapshots
+KEYFRAME_INTERVAL = 10
+
+
+def diff_fields(old: Dict, new: Dict) -> Dict:
+    """
+    Field-level changes between two versions of a job.
+
+    Fields missing from `new` or empty there are treated as "not scraped" rather
+    than cleared, so they never produce a change.
+
+    Returns:
+        {field: [old_value, new_value]} for each changed tracked field
+    """
+    changes = {}
+    for field in TRACKED_FIELDS:
+        value = new.get(field)
+        if value not in (None, '') and value != old.get(field):
+            changes[field] = [old.get(field), value]
+    return changes
+
+
+def _deltas_since_keyframe(cursor, job_id) -> Optional[int]:
+    """Snapshots written after the job's latest keyframe, or None if it has none."""
+    row = cursor.execute('''
+        SELECT MAX(id) FROM job_snapshots
+        WHERE job_id = ? AND snapshot_data IS NOT NULL
+    ''', (job_id,)).fetchone()
+    if row[0] is None:
+        return None
+    return cursor.execute(
+        'SELECT COUNT(*) FROM job_snapshots WHERE job_id = ? AND id > ?',
+        (job_id, row[0])
+    ).fetchone()[0]
+
+
+def write_snapshots(cursor, changed_jobs: List[tuple], snapshot_date: str) -> int:
+    """
+    Record one delta snapshot per changed job.
+
+    Args:
+        cursor: sqlite3 cursor inside the ingest transaction
+        changed_jobs: (job_id, stored_fields, changes) tuples, where changes comes
+            from diff_fields()
+        snapshot_date: Timestamp stored on the snapshot rows
+
+    Returns:
+        Number of snapshot rows written
+    """
+    rows = []
+    for job_id, stored, changes in changed_jobs:
+        if not changes:
+            continue
+
+        since = _deltas_since_keyframe(cursor, job_id)
+        keyframe = None
+        if since is None or since + 1 >= KEYFRAME_INTERVAL:
+            state = {field: stored.get(field) for field in TRACKED_FIELDS}
+            state.update({field: new for field, (_, new) in changes.items()})
+            keyframe = json.dumps(state, ensure_ascii=False)
+
+        rows.append((job_id, snapshot_date, json.dumps(changes, ensure_ascii=False), keyframe))
+
+    cursor.executemany('''
+        INSERT INTO job_snapshots (job_id, snapshot_date, field_changes, snapshot_data)
+        VALUES (?, ?, ?, ?)
+    ''', rows)
+    return len(rows)
+
+
+def reconstruct_job(conn, job_id: int, at: Optional[str] = None) -> Optional[Dict]:
+    """
+    Tracked fields of a job as they were at a point in time.
+
+    Starts from the latest keyframe at or before `at` and applies the deltas after it.
+    Before the first recorded change, the state is taken from that change's old values.
+
+    Args:
+        conn: sqlite3 connection
+        job_id: jobs.id
+        at: ISO timestamp (default: latest version)
+
+    Returns:
+        {field: value} for TRACKED_FIELDS, or None if the job has no history
+    """
+    at = at or '9999-12-31T23:59:59'  # not numeric, so it compares as text
+    cursor = conn.cursor()
+
+    keyframe = cursor.execute('''
+        SELECT id, snapshot_data FROM job_snapshots
+        WHERE job_id = ? AND snapshot_data IS NOT NULL AND snapshot_date <= ?
+        ORDER BY id DESC LIMIT 1
+    ''', (job_id, at)).fetchone()
+
+    if keyframe is None:
+        # Before the first keyframe: undo the first recorded change
+        first = cursor.execute('''
+            SELECT field_changes, snapshot_data FROM job_snapshots
+            WHERE job_id = ? ORDER BY id LIMIT 1
+        ''', (job_id,)).fetchone()
+        if first is None:
+            return None
+        state = json.loads(first[1]) if first[1] else {}
+        state.update({field: old for field, (old, _) in json.loads(first[0]).items()})
+        return state
+
+    state = json.loads(keyframe[1])
+    for (field_changes,) in cursor.execute('''
+        SELECT field_changes FROM job_snapshots
+        WHERE job_id = ? AND id > ? AND snapshot_date <= ?
+        ORDER BY id
+    ''', (job_id, keyframe[0], at)):
+        state.update({field: new for field, (_, new) in json.loads(field_changes).items()})
+    return state
@@ -0,0 +1,49 @@
+"""
+Normalized tech stack of each job, stored in `job_tech`.
+
+enrich_job_data.py keeps a job's tech_stack as JSON ({category: [tech, ...]}) on the
+job row, and writes the same data as one (job_id, category, tech) row per skill
+here. Tech counts, top-N lists and "jobs using X" filters are then plain indexed
+SQL instead of parsing every job's JSON.
+
+Rows are keyed by job id like descriptions, so they stay attached while a job is
+archived. `tech` compares case-insensitively.
+"""
+
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def write_job_tech(cursor, job_id: int, tech_stack: Dict[str, List[str]]):
+    """
+    Replace a job's job_tech rows with its current tech stack.
+
+    Args:
+        cursor: sqlite3 cursor inside the caller's transaction
+        job_id: Job the stack belongs to
+        tech_stack: {category: [tech, ...]} as produced by TechStackExtractor
+    """
+    cursor.execute("DELETE FROM job_tech WHERE job_id = ?", (job_id,))
+    cursor.executemany(
+        "INSERT OR IGNORE INTO job_tech (job_id, category, tech) VALUES (?, ?, ?)",
+        [(job_id, category, tech) for category, techs in tech_stack.items() for tech in techs]
+    )
+
+
+def rebuild_job_tech(cursor):
+    """Re-derive job_tech from the tech_stack JSON of all jobs, archived ones included."""
+    cursor.execute("DELETE FROM job_tech")
+    # json_each raises on malformed JSON, so only valid objects are expanded
+    cursor.execute('''
+        INSERT OR IGNORE INTO job_tech (job_id, category, tech)
+        SELECT j.id, c.key, t.value
+        FROM all_jobs j,
+             json_each(CASE WHEN json_valid(j.tech_stack) THEN
+                 CASE WHEN json_type(j.tech_stack) = 'object' THEN j.tech_stack END
+             END) c,
+             json_each(CASE WHEN c.type = 'array' THEN c.value END) t
+        WHERE t.type = 'text'
+    ''')
+    logger.info(f"🧰 Stored {cursor.rowcount} job/tech pairs")
@@ -0,0 +1,510 @@
+"""
+Versioned schema migrations for the SQLite database.
+
+This module is the single owner of the schema. Each migration is a numbered step;
+the highest applied number is stored in `PRAGMA user_version`, so migrate() only
+runs the steps a database hasn't seen yet. Databases created by older code (which
+built tables ad hoc and patched columns on with ALTER TABLE) start at version 0,
+so every step is written to be safe on a table that already has some of its columns.
+
+Usage:
+    python -m database.migrations [db_path]
+"""
+
+import sys
+import logging
+
+from database.sqlite import connect
+
+logger = logging.getLogger(__name__)
+
+
+def _columns(cursor, table):
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def _add_columns(cursor, table, columns):
+    """Add (name, definition) columns that the table doesn't have yet.
+
+    Columns added to jobs are mirrored to jobs_archive (see _sync_archive).
+    """
+    existing = _columns(cursor, table)
+    for name, definition in columns:
+        if name not in existing:
+            logger.info(f"➕ Adding column: {table}.{name}")
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+    if table == 'jobs' and _columns(cursor, 'jobs_archive'):
+        _sync_archive(cursor)
+
+
+def _sync_archive(cursor):
+    """Give jobs_archive every jobs column and rebuild the all_jobs union view.
+
+    The view lists columns explicitly, so it stays correct whatever order the two
+    tables gained their columns in.
+    """
+    cursor.execute("PRAGMA table_info(jobs)")
+    job_columns = [(row[1], row[2]) for row in cursor.fetchall()]
+    archive_columns = _columns(cursor, 'jobs_archive')
+    for name, column_type in job_columns:
+        if name not in archive_columns:
+            cursor.execute(f"ALTER TABLE jobs_archive ADD COLUMN {name} {column_type}")
+
+    names = ', '.join(name for name, _ in job_columns)
+    cursor.execute("DROP VIEW IF EXISTS all_jobs")
+    cursor.execute(f'''
+        CREATE VIEW all_jobs AS
+        SELECT {names}, NULL AS archived_at FROM jobs
+        UNION ALL
+        SELECT {names}, archived_at FROM jobs_archive
+    ''')
+
+
+def _has_unique_index(cursor, table, column):
+    """Whether some unique index (including UNIQUE constraints) covers exactly this column."""
+    cursor.execute(f"PRAGMA index_list({table})")
+    for row in cursor.fetchall():
+        index_name, unique = row[1], row[2]
+        if not unique:
+            continue
+        cursor.execute(f"PRAGMA index_info('{index_name}')")
+        if [info[2] for info in cursor.fetchall()] == [column]:
+            return True
+    return False
+
+
+def _create_base_tables(cursor):
+    """jobs, job_snapshots and scrape_logs as originally defined."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            external_id TEXT UNIQUE,
+            title TEXT NOT NULL,
+            company TEXT NOT NULL,
+            location TEXT,
+            salary_range TEXT,
+            job_type TEXT,
+            description TEXT,
+            url TEXT UNIQUE,
+            category TEXT,
+            skills TEXT,
+            first_seen_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_seen_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_active BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id INTEGER,
+            snapshot_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            field_changes TEXT,
+            snapshot_data TEXT,
+            FOREIGN KEY (job_id) REFERENCES jobs (id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS scrape_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT NOT NULL,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            jobs_found INTEGER DEFAULT 0,
+            jobs_new INTEGER DEFAULT 0,
+            jobs_updated INTEGER DEFAULT 0,
+            jobs_removed INTEGER DEFAULT 0,
+            status TEXT DEFAULT 'success',
+            error_message TEXT,
+            duration_seconds REAL
+        )
+    ''')
+
+
+def _add_source_tracking(cursor):
+    """Multi-source columns (previously patched on by fix_database_columns.py)."""
+    _add_columns(cursor, 'jobs', [
+        ('source', "TEXT DEFAULT 'seek'"),
+        ('is_new_today', 'BOOLEAN DEFAULT 0'),
+    ])
+
+
+def _add_ingest_runs(cursor):
+    """Ingest runs, conditional-fetch validators and canonical URLs."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ingest_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            sources TEXT,
+            jobs_seen INTEGER DEFAULT 0,
+            jobs_new INTEGER DEFAULT 0
+        )
+    ''')
+
+    _add_columns(cursor, 'jobs', [
+        ('first_seen_run_id', 'INTEGER'),
+        ('description_hash', 'TEXT'),
+        ('etag', 'TEXT'),
+        ('last_modified', 'TEXT'),
+    ])
+
+    if 'canonical_url' not in _columns(cursor, 'jobs'):
+        _add_columns(cursor, 'jobs', [('canonical_url', 'TEXT')])
+        _backfill_canonical_urls(cursor)
+
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_canonical_url ON jobs(canonical_url)")
+
+
+def _backfill_canonical_urls(cursor):
+    """Fill canonical_url for existing rows.
+
+    Rows that canonicalize to an already-taken URL are duplicates created by the old
+    prefix matching; they keep a NULL canonical_url and are marked inactive.
+    """
+    from scrapers.url_canonical import canonicalize_url
+
+    cursor.execute('''
+        SELECT id, source, url FROM jobs
+        WHERE url IS NOT NULL
+        ORDER BY id
+    ''')
+
+    taken = set()
+    updates = []
+    duplicates = []
+    for job_id, source, url in cursor.fetchall():
+        canonical = canonicalize_url(url, source)
+        if canonical in taken:
+            duplicates.append((job_id,))
+        else:
+            taken.add(canonical)
+            updates.append((canonical, job_id))
+
+    cursor.executemany("UPDATE jobs SET canonical_url = ? WHERE id = ?", updates)
+    cursor.executemany("UPDATE jobs SET is_active = 0 WHERE id = ?", duplicates)
+    logger.info(f"🔗 Backfilled {len(updates)} canonical URLs, retired {len(duplicates)} duplicates")
+
+
+def _add_enrichment_columns(cursor):
+    """Tech-stack columns filled by enrich_job_data.py."""
+    _add_columns(cursor, 'jobs', [
+        ('tech_stack', 'TEXT'),          # JSON格式的技术栈
+        ('work_type', 'TEXT'),           # remote/hybrid/onsite
+        ('experience_level', 'TEXT'),    # junior/mid/senior/expert
+        ('benefits', 'TEXT'),            # JSON数组
+        ('skills_count', 'INTEGER'),     # 技能总数
+    ])
+
+
+def _add_query_indexes(cursor):
+    """Indexes for the API filters, sort orders and the ingest merge."""
+    # Active-job listings filtered by source / category; per-source deactivation
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_is_active_source ON jobs(is_active, source)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_is_active_category ON jobs(is_active, category)")
+
+    # Default sort order and date-range statistics
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_first_seen_date ON jobs(first_seen_date)")
+
+    # "New" jobs are looked up by the latest run id
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_first_seen_run_id ON jobs(first_seen_run_id)")
+
+    # The ingest upsert needs a unique index on external_id; tables created with the
+    # UNIQUE constraint already have one
+    if not _has_unique_index(cursor, 'jobs', 'external_id'):
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_external_id ON jobs(external_id)")
+
+
+def _add_snapshot_index(cursor):
+    """Delta history is read per job, newest keyframe first (database/job_history.py)."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_snapshots_job_id ON job_snapshots(job_id, id)")
+
+
+def _move_descriptions(cursor):
+    """Move descriptions out of jobs into the compressed job_descriptions side table."""
+    from database.descriptions import store_descriptions, retrain_dictionary
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS description_dicts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            zdict BLOB NOT NULL,
+            sample_count INTEGER,
+            created_at TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_descriptions (
+            job_id INTEGER PRIMARY KEY REFERENCES jobs (id),
+            body BLOB NOT NULL,
+            dict_id INTEGER REFERENCES description_dicts (id),
+            raw_length INTEGER
+        )
+    ''')
+    cursor.execute('''
+        CREATE VIEW IF NOT EXISTS job_description_text AS
+        SELECT d.job_id, zlib_decompress(d.body, z.zdict) AS description
+        FROM job_descriptions d
+        LEFT JOIN description_dicts z ON z.id = d.dict_id
+    ''')
+    _add_columns(cursor, 'jobs', [('description_preview', 'TEXT')])
+
+    rows = cursor.execute('''
+        SELECT id, description FROM jobs
+        WHERE description IS NOT NULL AND description != ''
+    ''').fetchall()
+    store_descriptions(cursor, rows)
+    if rows:
+        retrain_dictionary(cursor)
+    # The freed pages are reused by later writes; VACUUM returns them to the OS
+    cursor.execute("UPDATE jobs SET description = NULL WHERE description IS NOT NULL")
+    logger.info(f"🗜️  Moved {len(rows)} descriptions to job_descriptions")
+
+
+def _add_jobs_archive(cursor):
+    """Cold storage for long-inactive jobs (database/archive.py) and the all_jobs view."""
+    # Same columns as jobs, without its constraints; ids are kept so snapshots and
+    # descriptions still join
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS jobs_archive AS
+        SELECT * FROM jobs WHERE 0
+    ''')
+    _add_columns(cursor, 'jobs_archive', [('archived_at', 'TIMESTAMP')])
+    _sync_archive(cursor)
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_archive_id ON jobs_archive(id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_archive_external_id ON jobs_archive(external_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_archive_canonical_url ON jobs_archive(canonical_url)")
+
+
+def _add_scrape_timing(cursor):
+    """Per-phase timings and page throughput on scrape_logs (scrapers/scrape_metrics.py)."""
+    _add_columns(cursor, 'scrape_logs', [
+        ('run_id', 'INTEGER REFERENCES ingest_runs (id)'),
+        ('pages', 'INTEGER'),
+        ('pages_per_second', 'REAL'),
+        ('driver_startup_seconds', 'REAL'),
+        ('listing_seconds', 'REAL'),
+        ('detail_seconds', 'REAL'),
+        ('parse_seconds', 'REAL'),
+        ('db_write_seconds', 'REAL'),
+    ])
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_scrape_logs_timestamp ON scrape_logs(timestamp)")
+
+
+def _add_search_index(cursor):
+    """FTS5 index over title, company and description (database/search.py).
+
+    The index reads its text from the job_search view (external content), so
+    descriptions stay stored once, compressed. Triggers keep it in step with jobs
+    and job_descriptions; a delete must pass the exact text that was indexed, which
+    is why the description triggers decompress the old body.
+    """
+    cursor.execute('''
+        CREATE VIEW IF NOT EXISTS job_search AS
+        SELECT j.id, j.title, j.company, t.description
+        FROM jobs j
+        LEFT JOIN job_description_text t ON t.job_id = j.id
+    ''')
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            title, company, description,
+            content='job_search', content_rowid='id',
+            tokenize="unicode61 tokenchars '+#'"
+        )
+    ''')
+
+    description_of = "(SELECT description FROM job_description_text WHERE job_id = {}.id)"
+    triggers = [f'''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts (rowid, title, company, description)
+            VALUES (NEW.id, NEW.title, NEW.company, {description_of.format('NEW')});
+        END
+    ''', f'''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description)
+            VALUES ('delete', OLD.id, OLD.title, OLD.company, {description_of.format('OLD')});
+        END
+    ''', f'''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, company ON jobs
+        WHEN OLD.title IS NOT NEW.title OR OLD.company IS NOT NEW.company BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description)
+            VALUES ('delete', OLD.id, OLD.title, OLD.company, {description_of.format('OLD')});
+            INSERT INTO jobs_fts (rowid, title, company, description)
+            VALUES (NEW.id, NEW.title, NEW.company, {description_of.format('NEW')});
+        END
+    ''']
+
+    # Descriptions of archived jobs are not indexed
+    old_text = "zlib_decompress(OLD.body, (SELECT zdict FROM description_dicts WHERE id = OLD.dict_id))"
+    new_text = "zlib_decompress(NEW.body, (SELECT zdict FROM description_dicts WHERE id = NEW.dict_id))"
+    triggers += [f'''
+        CREATE TRIGGER IF NOT EXISTS job_descriptions_fts_insert AFTER INSERT ON job_descriptions
+        WHEN EXISTS (SELECT 1 FROM jobs WHERE id = NEW.job_id) BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description)
+            SELECT 'delete', id, title, company, NULL FROM jobs WHERE id = NEW.job_id;
+            INSERT INTO jobs_fts (rowid, title, company, description)
+            SELECT id, title, company, {new_text} FROM jobs WHERE id = NEW.job_id;
+        END
+    ''', f'''
+        CREATE TRIGGER IF NOT EXISTS job_descriptions_fts_update AFTER UPDATE OF body ON job_descriptions
+        WHEN EXISTS (SELECT 1 FROM jobs WHERE id = NEW.job_id)
+         AND {old_text} IS NOT {new_text} BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description)
+            SELECT 'delete', id, title, company, {old_text} FROM jobs WHERE id = OLD.job_id;
+            INSERT INTO jobs_fts (rowid, title, company, description)
+            SELECT id, title, company, {new_text} FROM jobs WHERE id = NEW.job_id;
+        END
+    ''', f'''
+        CREATE TRIGGER IF NOT EXISTS job_descriptions_fts_delete AFTER DELETE ON job_descriptions
+        WHEN EXISTS (SELECT 1 FROM jobs WHERE id = OLD.job_id) BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description)
+            SELECT 'delete', id, title, company, {old_text} FROM jobs WHERE id = OLD.job_id;
+            INSERT INTO jobs_fts (rowid, title, company, description)
+            SELECT id, title, company, NULL FROM jobs WHERE id = OLD.job_id;
+        END
+    ''']
+    for trigger in triggers:
+        cursor.execute(trigger)
+
+    from database.search import RANK_FUNCTION, rebuild_search_index
+    # ORDER BY rank uses these column weights
+    cursor.execute("INSERT INTO jobs_fts (jobs_fts, rank) VALUES ('rank', ?)", (RANK_FUNCTION,))
+    rebuild_search_index(cursor)
+
+
+def _add_listing_index(cursor):
+    """Keyset pagination of the unfiltered job list walks (is_active, id) backwards."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_is_active_id ON jobs(is_active, id)")
+
+
+def _add_search_vocabulary(cursor):
+    """Per-term document counts of the search index, for result count estimates (database/counts.py)."""
+    cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts_vocab USING fts5vocab(jobs_fts, 'row')")
+
+
+def _add_analytics_rollups(cursor):
+    """Pre-aggregated tables the analytics endpoints read (database/rollups.py)."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS daily_source_counts (
+            day TEXT NOT NULL,
+            source TEXT,
+            count INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_source_counts_day ON daily_source_counts(day)")
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS analytics_counts (
+            dimension TEXT NOT NULL,
+            value TEXT,
+            active_count INTEGER NOT NULL,
+            total_count INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_analytics_counts_dimension ON analytics_counts(dimension)")
+    # Incremental refreshes read the archive by first-seen date as well
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_archive_first_seen_date ON jobs_archive(first_seen_date)")
+
+    from database.rollups import refresh_rollups_in
+    refresh_rollups_in(cursor, full=True)
+
+
+def _add_job_tech(cursor):
+    """Normalized (job_id, category, tech) rows of the enrichment tech stack (database/job_tech.py)."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_tech (
+            job_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            tech TEXT NOT NULL COLLATE NOCASE,
+            PRIMARY KEY (job_id, category, tech)
+        ) WITHOUT ROWID
+    ''')
+    # Counts per category and tech; jobs using a tech
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_tech_category_tech ON job_tech(category, tech)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_tech_tech ON job_tech(tech, job_id)")
+
+    from database.job_tech import rebuild_job_tech
+    rebuild_job_tech(cursor)
+
+
+# (version, description, step) -- append only, never renumber
+MIGRATIONS = [
+    (1, 'base tables', _create_base_tables),
+    (2, 'source tracking columns', _add_source_tracking),
+    (3, 'ingest runs, validators and canonical URLs', _add_ingest_runs),
+    (4, 'tech-stack enrichment columns', _add_enrichment_columns),
+    (5, 'query indexes', _add_query_indexes),
+    (6, 'job snapshot index', _add_snapshot_index),
+    (7, 'compressed description storage', _move_descriptions),
+    (8, 'jobs archive', _add_jobs_archive),
+    (9, 'scrape timing columns', _add_scrape_timing),
+    (10, 'full-text search index', _add_search_index),
+    (11, 'job listing index', _add_listing_index),
+    (12, 'search vocabulary table', _add_search_vocabulary),
+    (13, 'analytics rollup tables', _add_analytics_rollups),
+    (14, 'normalized job tech table', _add_job_tech),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn):
+    """Schema version recorded in the database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """
+    Bring a database up to SCHEMA_VERSION.
+
+    Each pending migration runs in its own write transaction together with the
+    user_version bump, so a failed step leaves the database at the previous version.
+    The connection must not have an open transaction.
+
+    Args:
+        conn: sqlite3 connection
+
+    Returns:
+        List of migration versions that were applied (empty if up to date)
+    """
+    if get_version(conn) >= SCHEMA_VERSION:
+        return []
+
+    applied = []
+    for version, description, step in MIGRATIONS:
+        # Take the write lock before re-checking, so concurrent processes
+        # (scraper and web app) don't apply the same step twice
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if get_version(conn) >= version:
+                conn.rollback()
+                continue
+            logger.info(f"🗄️  Applying migration {version}: {description}")
+            step(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error(f"❌ Migration {version} failed")
+            raise
+        applied.append(version)
+
+    if applied:
+        # Refresh planner statistics so the new indexes are actually chosen
+        conn.execute("ANALYZE")
+        conn.commit()
+        logger.info(f"✅ Schema at version {SCHEMA_VERSION}")
+
+    return applied
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    conn = connect(sys.argv[1] if len(sys.argv) > 1 else None)
+    try:
+        applied = migrate(conn)
+        print(f"Schema version {get_version(conn)} (applied: {applied or 'none'})")
+    finally:
+        conn.close()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, Numeric, Float, Index, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -6,24 +6,49 @@ from datetime import datetime
 Base = declarative_base()
 
 class Job(Base):
-    """Main job listings table with historical tracking."""
+    """Main job listings table with historical tracking.
+    
+    Mirrors the schema owned by database/migrations.py; change that first.
+    """
     
     __tablename__ = 'jobs'
+    __table_args__ = (
+        Index('idx_jobs_is_active_source', 'is_active', 'source'),
+        Index('idx_jobs_is_active_category', 'is_active', 'category'),
+        Index('idx_jobs_created_at', 'created_at'),
+        Index('idx_jobs_first_seen_date', 'first_seen_date'),
+        Index('idx_jobs_first_seen_run_id', 'first_seen_run_id'),
+        Index('idx_jobs_is_active_id', 'is_active', 'id'),
+        Index('idx_jobs_canonical_url', 'canonical_url', unique=True),
+    )
     
     id = Column(Integer, primary_key=True)
-    external_id = Column(String(255), unique=True, nullable=False)  # Seek job ID
+    external_id = Column(String(255), unique=True, nullable=False)  # Source job ID, e.g. 'linkedin_123'
     title = Column(String(500), nullable=False)
     company = Column(String(255), nullable=False)
     location = Column(String(255))
     salary_range = Column(String(100))
     job_type = Column(String(50))  # Full-time, Part-time, Contract, etc.
-    description = Column(Text)
-    url = Column(String(1000))
+    description = Column(Text)  # Legacy; full text lives in job_descriptions (database/descriptions.py)
+    description_preview = Column(Text)  # Truncated text for listings
+    url = Column(String(1000), unique=True)
+    canonical_url = Column(String(1000))  # Dedup key, see scrapers/url_canonical.py
     category = Column(String(100))  # Classified by LLM
     skills = Column(JSON)  # Extracted skills as JSON array
+    source = Column(String(50), default='seek')
     first_seen_date = Column(DateTime, default=datetime.utcnow)
     last_seen_date = Column(DateTime, default=datetime.utcnow)
     is_active = Column(Boolean, default=True)
+    is_new_today = Column(Boolean, default=False)  # Legacy; "new" is first_seen_run_id == latest run
+    first_seen_run_id = Column(Integer)  # ingest_runs.id
+    description_hash = Column(String(64))  # sha256 of the description
+    etag = Column(String(255))  # HTTP validators of the detail page
+    last_modified = Column(String(255))
+    tech_stack = Column(Text)  # JSON, filled by enrich_job_data.py
+    work_type = Column(String(20))  # remote/hybrid/onsite
+    experience_level = Column(String(20))  # junior/mid/senior/expert
+    benefits = Column(Text)  # JSON array
+    skills_count = Column(Integer)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -34,15 +59,18 @@ class Job(Base):
         return f"<Job(id={self.id}, title='{self.title}', company='{self.company}')>"
 
 class JobSnapshot(Base):
-    """Historical snapshots for tracking job changes."""
+    """Historical snapshots for tracking job changes (written by database/job_history.py)."""
     
     __tablename__ = 'job_snapshots'
+    __table_args__ = (
+        Index('idx_job_snapshots_job_id', 'job_id', 'id'),
+    )
     
     id = Column(Integer, primary_key=True)
     job_id = Column(Integer, ForeignKey('jobs.id'), nullable=False)
     snapshot_date = Column(DateTime, default=datetime.utcnow)
-    field_changes = Column(JSON)  # Track what fields changed
-    snapshot_data = Column(JSON)  # Full job data at this point
+    field_changes = Column(JSON)  # {field: [old, new]} for the changed fields
+    snapshot_data = Column(JSON)  # Full tracked state on keyframes, NULL on delta rows
     
     # Relationships
     job = relationship("Job", back_populates="snapshots")
@@ -50,10 +78,54 @@ class JobSnapshot(Base):
     def __repr__(self):
         return f"<JobSnapshot(id={self.id}, job_id={self.job_id}, date={self.snapshot_date})>"
 
+class JobDescription(Base):
+    """zlib-compressed full description, one row per job."""
+    
+    __tablename__ = 'job_descriptions'
+    
+    job_id = Column(Integer, ForeignKey('jobs.id'), primary_key=True)
+    body = Column(LargeBinary, nullable=False)
+    dict_id = Column(Integer, ForeignKey('description_dicts.id'))  # Preset dictionary used
+    raw_length = Column(Integer)
+    
+    def __repr__(self):
+        return f"<JobDescription(job_id={self.job_id}, raw_length={self.raw_length})>"
+
+class DescriptionDict(Base):
+    """Preset zlib dictionary trained on the description corpus."""
+    
+    __tablename__ = 'description_dicts'
+    
+    id = Column(Integer, primary_key=True)
+    zdict = Column(LargeBinary, nullable=False)
+    sample_count = Column(Integer)
+    created_at = Column(DateTime)
+    
+    def __repr__(self):
+        return f"<DescriptionDict(id={self.id}, sample_count={self.sample_count})>"
+
+class IngestRun(Base):
+    """One row per integrated-scraper ingest."""
+    
+    __tablename__ = 'ingest_runs'
+    
+    id = Column(Integer, primary_key=True)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    sources = Column(String(255))  # Comma-separated source names
+    jobs_seen = Column(Integer, default=0)
+    jobs_new = Column(Integer, default=0)
+    
+    def __repr__(self):
+        return f"<IngestRun(id={self.id}, sources='{self.sources}')>"
+
 class ScrapeLog(Base):
     """Track scraping runs and statistics."""
     
     __tablename__ = 'scrape_logs'
+    __table_args__ = (
+        Index('idx_scrape_logs_timestamp', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True)
     source = Column(String(50), nullable=False)  # 'seek', 'linkedin', etc.
@@ -66,5 +138,15 @@ class ScrapeLog(Base):
     error_message = Column(Text)
     duration_seconds = Column(Numeric(10, 2))
     
+    # Per-phase timings (see scrapers/scrape_metrics.py)
+    run_id = Column(Integer, ForeignKey('ingest_runs.id'))
+    pages = Column(Integer)
+    pages_per_second = Column(Float)
+    driver_startup_seconds = Column(Float)
+    listing_seconds = Column(Float)
+    detail_seconds = Column(Float)
+    parse_seconds = Column(Float)
+    db_write_seconds = Column(Float)
+    
     def __repr__(self):
         return f"<ScrapeLog(id={self.id}, source='{self.source}', status='{self.status}')>"
@@ -0,0 +1,125 @@
+"""
+Materialized analytics rollups.
+
+The dashboard's analytics endpoints read small pre-aggregated tables instead of
+grouping the whole job history on every request:
+
+    daily_source_counts  jobs first seen per day and source (all_jobs)
+    analytics_counts     active and total jobs per category, company, source,
+                         experience level and work type
+
+The ingest refreshes them after saving a run, and enrich_job_data.py after
+enrichment, in both cases before the read snapshot is published. Jobs never change
+their first-seen date, so the daily table is refreshed incrementally from its
+latest day on. The per-value counts depend on columns that change in place
+(is_active, enrichment results) and are recomputed in one grouped pass per refresh.
+
+Usage:
+    python -m database.rollups [--full] [--db PATH]
+"""
+
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# dimension -> all_jobs column counted in analytics_counts
+DIMENSION_COLUMNS = {
+    'source': 'source',
+    'category': 'category',
+    'company': 'company',
+    'experience_level': 'experience_level',
+}
+
+
+def _refresh_daily_counts(cursor, full: bool) -> Optional[str]:
+    since = None if full else cursor.execute("SELECT MAX(day) FROM daily_source_counts").fetchone()[0]
+    if since is None:
+        cursor.execute("DELETE FROM daily_source_counts")
+        condition, params = "first_seen_date IS NOT NULL", ()
+    else:
+        # The latest day may have been partial at the last refresh
+        cursor.execute("DELETE FROM daily_source_counts WHERE day >= ?", (since,))
+        condition, params = "first_seen_date >= ?", (since,)
+
+    cursor.execute(f'''
+        INSERT INTO daily_source_counts (day, source, count)
+        SELECT DATE(first_seen_date), source, COUNT(*)
+        FROM all_jobs
+        WHERE {condition}
+        GROUP BY DATE(first_seen_date), source
+    ''', params)
+    return since
+
+
+def _refresh_value_counts(cursor):
+    cursor.execute("DELETE FROM analytics_counts")
+    for dimension, column in DIMENSION_COLUMNS.items():
+        cursor.execute(f'''
+            INSERT INTO analytics_counts (dimension, value, active_count, total_count)
+            SELECT ?, {column}, SUM(is_active = 1), COUNT(*)
+            FROM all_jobs
+            GROUP BY {column}
+        ''', (dimension,))
+
+    # work_type holds a JSON list, e.g. ["Remote", "Hybrid"]; anything else is skipped
+    # (json_each raises on malformed JSON, hence the nested CASE)
+    cursor.execute('''
+        INSERT INTO analytics_counts (dimension, value, active_count, total_count)
+        SELECT 'work_type', t.value, SUM(j.is_active = 1), COUNT(*)
+        FROM all_jobs j, json_each(
+            CASE WHEN json_valid(j.work_type) THEN
+                CASE WHEN json_type(j.work_type) = 'array' THEN j.work_type END
+            END
+        ) t
+        GROUP BY t.value
+    ''')
+
+
+def refresh_rollups_in(cursor, full: bool = False):
+    """
+    Refresh the rollup tables inside the caller's transaction.
+
+    Args:
+        cursor: sqlite3 cursor
+        full: Rebuild the daily counts from scratch instead of from the latest day
+    """
+    since = _refresh_daily_counts(cursor, full)
+    _refresh_value_counts(cursor)
+    logger.info(f"📈 Refreshed analytics rollups ({f'daily counts since {since}' if since else 'full'})")
+
+
+def refresh_rollups(conn, full: bool = False):
+    """
+    Refresh the rollup tables in their own write transaction.
+
+    Args:
+        conn: sqlite3 connection without an open transaction
+        full: Rebuild the daily counts from scratch
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        refresh_rollups_in(conn.cursor(), full)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+if __name__ == '__main__':
+    import argparse
+    from database.sqlite import connect
+    from database.migrations import migrate
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Refresh the analytics rollup tables')
+    parser.add_argument('--full', action='store_true', help='Rebuild the daily counts from scratch')
+    parser.add_argument('--db', default=None, help='Database path (default: project root)')
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    try:
+        migrate(conn)
+        refresh_rollups(conn, args.full)
+    finally:
+        conn.close()
@@ -0,0 +1,125 @@
+"""
+Full-text job search.
+
+`jobs_fts` is an FTS5 index over title, company and description of the jobs in the
+hot table. It stores no text of its own: rows are read back through the job_search
+view, so snippets decompress only the descriptions of the hits. Triggers created by
+migration 10 keep the index in step with every write to jobs and job_descriptions.
+
+Results are ranked with BM25, weighting title matches above company and description
+matches. `jobs_fts_vocab` exposes per-term document counts of the index, used to
+estimate result counts (database/counts.py).
+
+Usage:
+    python -m database.search rebuild [db_path]
+    python -m database.search check [db_path]
+    python -m database.search query "react developer" [db_path]
+"""
+
+import re
+import sys
+import logging
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# bm25 weights for (title, company, description)
+RANK_FUNCTION = 'bm25(10.0, 5.0, 1.0)'
+
+# Matches the index tokenizer (unicode61 with '+' and '#' as token characters)
+TOKEN_PATTERN = re.compile(r"[\w+#]+")
+
+SNIPPET_START = '<mark>'
+SNIPPET_END = '</mark>'
+SNIPPET_TOKENS = 24
+
+# Best-matching fragment of the matched text, for result lists
+SNIPPET_SQL = f"snippet(jobs_fts, -1, '{SNIPPET_START}', '{SNIPPET_END}', '…', {SNIPPET_TOKENS})"
+
+
+def search_terms(text: str) -> List[Tuple[str, bool]]:
+    """
+    Index terms in free-text user input, as (term, is_prefix) pairs.
+
+    Every word must match; the last one also matches as a prefix, so results
+    update while the user is still typing.
+    """
+    terms = TOKEN_PATTERN.findall(text.lower())
+    return [(term, i == len(terms) - 1) for i, term in enumerate(terms)]
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    Turn free-text user input into an FTS5 MATCH expression (see search_terms()).
+
+    Words are quoted, so FTS5 operators and punctuation in the input are never
+    interpreted.
+
+    Returns:
+        MATCH expression, or None if the input has no searchable words
+    """
+    terms = search_terms(text)
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' if is_prefix else f'"{term}"' for term, is_prefix in terms)
+
+
+def rebuild_search_index(cursor):
+    """Re-read every job from the job_search view into the index."""
+    cursor.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+    count = cursor.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+    logger.info(f"🔎 Indexed {count} jobs for full-text search")
+
+
+def check_search_index(conn) -> bool:
+    """Whether the index matches the job_search view (FTS5 integrity-check)."""
+    # The check is issued as an INSERT, which opens a transaction; it writes nothing
+    owns_transaction = not conn.in_transaction
+    try:
+        conn.execute("INSERT INTO jobs_fts (jobs_fts, rank) VALUES ('integrity-check', 1)")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Search index is out of date: {e}")
+        return False
+    finally:
+        if owns_transaction and conn.in_transaction:
+            conn.rollback()
+
+
+if __name__ == '__main__':
+    from database.sqlite import connect
+    from database.migrations import migrate
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if len(sys.argv) < 2 or sys.argv[1] not in ('rebuild', 'check', 'query'):
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    args = sys.argv[2:]
+    text = args.pop(0) if command == 'query' and args else ''
+    conn = connect(args[0] if args else None)
+    try:
+        migrate(conn)
+        if command == 'rebuild':
+            rebuild_search_index(conn.cursor())
+            conn.commit()
+        elif command == 'check':
+            if check_search_index(conn):
+                print("✅ Search index is consistent")
+            else:
+                sys.exit(1)
+        else:
+            match = build_match_query(text)
+            rows = conn.execute(f'''
+                SELECT j.id, j.title, j.company, {SNIPPET_SQL}
+                FROM jobs_fts
+                JOIN jobs j ON j.id = jobs_fts.rowid
+                WHERE jobs_fts MATCH ?
+                ORDER BY rank
+                LIMIT 10
+            ''', (match,)).fetchall() if match else []
+            for job_id, title, company, snippet in rows:
+                print(f"{job_id:>6}  {title} @ {company}\n        {snippet}")
+    finally:
+        conn.close()
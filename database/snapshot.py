@@ -0,0 +1,162 @@
+"""
+Read-only serving snapshot of the SQLite database.
+
+After each ingest the scraper publishes a compacted copy of the live database
+(`VACUUM INTO`, which rebuilds every index) next to it, e.g. job_scraper.db ->
+job_scraper.snapshot.db. The copy is written to a temp file and renamed over the
+previous snapshot, so a publish is atomic.
+
+The web app, the AI assistant and the dashboard read the snapshot opened with
+`mode=ro&immutable=1`: SQLite takes no locks and never checks for changes, so reads
+don't contend with the scraper at all. Connections still open on the old file keep
+reading it until get_read_connection() notices the new one and swaps.
+
+Readers fall back to the live database while there is no snapshot, or while the
+snapshot predates the current schema version.
+
+Usage:
+    python -m database.snapshot [db_path]
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+from urllib.parse import quote
+
+from database.sqlite import DEFAULT_DB_PATH, connect, get_connection
+from database.migrations import SCHEMA_VERSION
+from database.descriptions import decompress_text
+from database.generation import bump_generation
+
+logger = logging.getLogger(__name__)
+
+# Read-side pragmas; journal and sync settings don't apply to an immutable file
+READ_PRAGMAS = [
+    ('cache_size', -32000),
+    ('mmap_size', 268435456),
+    ('temp_store', 'MEMORY'),
+]
+
+_local = threading.local()
+
+
+def snapshot_path(db_path=None):
+    """Snapshot file that belongs to a live database."""
+    root, ext = os.path.splitext(os.path.abspath(db_path or DEFAULT_DB_PATH))
+    return f"{root}.snapshot{ext or '.db'}"
+
+
+def publish_snapshot(db_path=None):
+    """
+    Copy the live database into a fresh snapshot and swap it in.
+
+    Args:
+        db_path: Live database (default: job_scraper.db in the project root)
+
+    Returns:
+        Path of the published snapshot
+    """
+    target = snapshot_path(db_path)
+    staging = f"{target}.tmp"
+    if os.path.exists(staging):
+        os.remove(staging)
+
+    conn = connect(db_path)
+    try:
+        conn.execute("VACUUM INTO ?", (staging,))
+    finally:
+        conn.close()
+
+    # An immutable reader can't use a WAL, so the copy goes back to a rollback journal
+    staging_conn = sqlite3.connect(staging)
+    try:
+        staging_conn.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        staging_conn.close()
+
+    os.replace(staging, target)
+    logger.info(f"📸 Published read snapshot {os.path.basename(target)} "
+                f"({os.path.getsize(target) / 1024 / 1024:.1f} MB)")
+    # Cached API responses of the previous snapshot are now stale
+    bump_generation(db_path)
+    return target
+
+
+def open_snapshot(db_path=None, row_factory=None):
+    """
+    Open a new read-only connection to the current snapshot.
+
+    Args:
+        db_path: Live database the snapshot belongs to
+        row_factory: Optional row factory, e.g. sqlite3.Row
+
+    Returns:
+        sqlite3 connection, or None when there is no snapshot
+        or it was published before the current schema version
+    """
+    path = snapshot_path(db_path)
+    if not os.path.exists(path):
+        return None
+
+    conn = sqlite3.connect(f"file:{quote(path)}?mode=ro&immutable=1", uri=True, timeout=5)
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            logger.info("Read snapshot predates the current schema, using the live database")
+            conn.close()
+            return None
+    except sqlite3.DatabaseError as e:
+        logger.warning(f"Unreadable read snapshot {path}: {e}")
+        conn.close()
+        return None
+
+    for name, value in READ_PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value}")
+    conn.create_function('zlib_decompress', 2, decompress_text, deterministic=True)
+    if row_factory:
+        conn.row_factory = row_factory
+    return conn
+
+
+def get_read_connection(db_path=None):
+    """Return this thread's connection for read-only queries.
+
+    Uses the published snapshot when there is a current one, otherwise the live
+    database (see get_connection). A newly published snapshot is picked up on the
+    next call. Callers must not close the connection or write through it.
+    """
+    live_path = os.path.abspath(db_path or DEFAULT_DB_PATH)
+    path = snapshot_path(live_path)
+    try:
+        stat = os.stat(path)
+        version = (stat.st_ino, stat.st_mtime_ns)
+    except FileNotFoundError:
+        version = None
+
+    readers = getattr(_local, 'readers', None)
+    if readers is None:
+        readers = _local.readers = {}
+
+    cached = readers.get(path)
+    if cached and cached[0] == version:
+        return cached[1] or get_connection(live_path)
+
+    if cached and cached[1] is not None:
+        cached[1].close()
+    conn = open_snapshot(live_path, row_factory=sqlite3.Row) if version else None
+    readers[path] = (version, conn)
+    return conn or get_connection(live_path)
+
+
+if __name__ == '__main__':
+    import sys
+    from database.migrations import migrate
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    db_path = sys.argv[1] if len(sys.argv) > 1 else None
+    conn = connect(db_path)
+    try:
+        migrate(conn)
+    finally:
+        conn.close()
+    publish_snapshot(db_path)
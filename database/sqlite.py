@@ -0,0 +1,78 @@
+"""
+Shared SQLite connection layer.
+
+Every connection is opened in WAL mode with tuned pragmas, so the scraper's long
+write transaction no longer blocks dashboard and API reads. Web and analysis code
+should use get_connection(), which reuses one connection per thread and database.
+"""
+
+import os
+import sqlite3
+import threading
+import logging
+
+from database.descriptions import decompress_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'job_scraper.db')
+
+# Applied to every connection, in this order
+PRAGMAS = [
+    ('journal_mode', 'WAL'),           # readers never wait for the writer
+    ('synchronous', 'NORMAL'),         # safe with WAL, one fsync per checkpoint
+    ('busy_timeout', 5000),            # wait up to 5s for a competing writer
+    ('cache_size', -32000),            # ~32 MB page cache per connection
+    ('mmap_size', 268435456),          # map up to 256 MB of the file
+    ('temp_store', 'MEMORY'),          # temp tables and sorts stay in RAM
+]
+
+_local = threading.local()
+
+
+def connect(db_path=None, row_factory=None):
+    """Open a new connection with the shared pragmas applied.
+
+    Use this for one-off scripts that manage the connection lifetime themselves.
+
+    Args:
+        db_path: Database file (default: job_scraper.db in the project root)
+        row_factory: Optional row factory, e.g. sqlite3.Row
+    """
+    conn = sqlite3.connect(db_path or DEFAULT_DB_PATH, timeout=5)
+    for name, value in PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value}")
+    # Used by the job_description_text view
+    conn.create_function('zlib_decompress', 2, decompress_text, deterministic=True)
+    if row_factory:
+        conn.row_factory = row_factory
+    return conn
+
+
+def get_connection(db_path=None):
+    """Return this thread's reused connection to a database, opening it on first use.
+
+    The connection uses sqlite3.Row rows and must not be closed by callers;
+    use close_connections() when a thread is done with the database.
+    """
+    path = os.path.abspath(db_path or DEFAULT_DB_PATH)
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    conn = connections.get(path)
+    if conn is None:
+        conn = connect(path, row_factory=sqlite3.Row)
+        connections[path] = conn
+    return conn
+
+
+def close_connections():
+    """Close every connection cached for the current thread."""
+    connections = getattr(_local, 'connections', {})
+    for conn in connections.values():
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error closing connection: {e}")
+    connections.clear()
@@ -3,10 +3,13 @@
 丰富现有职位数据 - 提取技术栈和其他特征
 """
 
-import sqlite3
 import json
 import logging
 from tech_stack_extractor import TechStackExtractor
+from database.sqlite import connect
+from database.migrations import migrate
+from database.rollups import refresh_rollups
+from database.job_tech import write_job_tech
 from tqdm import tqdm
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -16,34 +19,18 @@ def enrich_jobs(db_path='job_scraper.db', batch_size=100):
     """为现有职位提取技术栈信息"""
     
     logger.info(f"📚 Opening database: {db_path}")
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # 检查是否需要添加新列
-    cursor.execute("PRAGMA table_info(jobs)")
-    columns = [col[1] for col in cursor.fetchall()]
-    
-    new_columns = [
-        ('tech_stack', 'TEXT'),  # JSON格式的技术栈
-        ('work_type', 'TEXT'),   # remote/hybrid/onsite
-        ('experience_level', 'TEXT'),  # junior/mid/senior/expert
-        ('benefits', 'TEXT'),    # JSON数组
-        ('skills_count', 'INTEGER')  # 技能总数
-    ]
-    
-    for col_name, col_type in new_columns:
-        if col_name not in columns:
-            logger.info(f"➕ Adding column: {col_name}")
-            cursor.execute(f"ALTER TABLE jobs ADD COLUMN {col_name} {col_type}")
+    conn = connect(db_path)
     
-    conn.commit()
+    # tech_stack 等列由迁移创建
+    migrate(conn)
+    cursor = conn.cursor()
     
     # 获取所有有描述的职位
     cursor.execute("""
-        SELECT id, title, description
-        FROM jobs 
-        WHERE description IS NOT NULL AND description != ''
-        ORDER BY id
+        SELECT j.id, j.title, t.description
+        FROM jobs j
+        JOIN job_description_text t ON t.job_id = j.id
+        ORDER BY j.id
     """)
     
     jobs = cursor.fetchall()
@@ -84,6 +71,7 @@ def enrich_jobs(db_path='job_scraper.db', batch_size=100):
                 extracted['skills_count'],
                 job_id
             ))
+            write_job_tech(cursor, job_id, extracted['tech_stack'])
             
             updated_count += 1
             
@@ -100,6 +88,9 @@ def enrich_jobs(db_path='job_scraper.db', batch_size=100):
     conn.commit()
     logger.info(f"🎉 Successfully enriched {updated_count} jobs!")
     
+    # 经验等级、工作类型的汇总表随之更新
+    refresh_rollups(conn)
+    
     # 生成统计报告
     generate_stats(cursor)
     
@@ -113,7 +104,7 @@ def generate_stats(cursor):
     # 经验等级分布
     cursor.execute("""
         SELECT experience_level, COUNT(*) 
-        FROM jobs 
+        FROM all_jobs 
         WHERE experience_level IS NOT NULL
         GROUP BY experience_level
         ORDER BY COUNT(*) DESC
@@ -126,7 +117,7 @@ def generate_stats(cursor):
     # 工作类型分布
     cursor.execute("""
         SELECT work_type, COUNT(*) 
-        FROM jobs 
+        FROM all_jobs 
         WHERE work_type IS NOT NULL AND work_type != '[]'
         GROUP BY work_type
         ORDER BY COUNT(*) DESC
@@ -144,7 +135,7 @@ def generate_stats(cursor):
     # 平均技能数
     cursor.execute("""
         SELECT AVG(skills_count), MIN(skills_count), MAX(skills_count)
-        FROM jobs 
+        FROM all_jobs 
         WHERE skills_count IS NOT NULL
     """)
     
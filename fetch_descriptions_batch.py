@@ -4,23 +4,26 @@
 每抓取N个职位就重启浏览器，避免内存泄漏
 """
 
-import sqlite3
 import logging
 import time
 from typing import List, Tuple
+from database.sqlite import connect, get_connection
+from database.migrations import migrate
+from database.descriptions import store_descriptions
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 def get_jobs_without_description(db_path: str, limit: int = None) -> List[Tuple]:
     """获取没有描述的职位"""
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
+    migrate(conn)
     cursor = conn.cursor()
     
     query = """
-        SELECT id, job_id, url, title, company
+        SELECT id, external_id, url, title, company
         FROM jobs 
-        WHERE (description IS NULL OR description = '') 
+        WHERE id NOT IN (SELECT job_id FROM job_descriptions)
         AND url IS NOT NULL
         AND source = 'seek'
         ORDER BY id DESC
@@ -29,6 +32,7 @@ def get_jobs_without_description(db_path: str, limit: int = None) -> List[Tuple]
     if limit:
         query += f" LIMIT {limit}"
     
+    cursor.execute(query)
     jobs = cursor.fetchall()
     conn.close()
     return jobs
@@ -74,14 +78,13 @@ def fetch_description_batch(db_path: str, batch_size: int = 5, max_total: int =
                     
                     if description:
                         # 保存到数据库
-                        conn = sqlite3.connect(db_path)
-                        cursor = conn.cursor()
-                        cursor.execute(
-                            "UPDATE jobs SET description = ? WHERE id = ?",
-                            (description, job_id)
+                        conn = get_connection(db_path)
+                        store_descriptions(conn.cursor(), [(job_id, description)])
+                        conn.execute(
+                            "UPDATE jobs SET description_hash = ? WHERE id = ?",
+                            (SeekScraper.content_hash(description), job_id)
                         )
                         conn.commit()
-                        conn.close()
                         
                         total_success += 1
                         logger.info(f"   ✅ Success (length: {len(description)})")
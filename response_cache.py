@@ -0,0 +1,247 @@
+"""
+Response caching for read-only JSON API endpoints.
+
+Responses are keyed on the request path, its query arguments and the current data
+generation (database/generation.py), which the ingest bumps. Nothing is ever
+invalidated explicitly: once the generation moves on, old keys are simply no longer
+asked for and age out.
+
+Two tiers:
+    1. An in-process LRU, so repeated requests to the same worker are a dict lookup
+    2. Redis (optional, REDIS_URL), shared by all workers; entries expire after
+       CACHE_TTL seconds
+
+Neither tier reads SQLite, so a warm dashboard load never touches the database.
+For tests and local runs without a Redis server, REDIS_URL=fake:// uses FakeRedis.
+
+conditional() adds HTTP validators on top: an ETag built from the same generation
+and query, so a browser revalidating an unchanged response gets a bodiless 304
+before the view (or the cache) is even consulted.
+"""
+
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Optional, Tuple
+from urllib.parse import urlencode
+
+from config import Config
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+LOCAL_CACHE_SIZE = 256
+CACHE_TTL = 24 * 3600  # seconds; data changes at most a few times a day
+KEY_PREFIX = 'job_scraper:response:'
+
+# Browsers may keep responses but must revalidate them (a cheap 304) before reuse
+CACHE_CONTROL = 'no-cache'
+
+
+class FakeRedis:
+    """In-memory stand-in for the few Redis commands used here (get, set, incr, delete)."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key):
+        value, expires_at = self._data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def get(self, key):
+        with self._lock:
+            return self._live(key)
+
+    def set(self, key, value, ex=None):
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        elif isinstance(value, int):
+            value = str(value).encode()
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._live(key) or 0) + 1
+            self._data[key] = (str(value).encode(), None)
+            return value
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_redis(url: str):
+    """
+    Shared Redis client for a URL, or None if it can't be created.
+
+    `fake://` URLs return a process-wide FakeRedis.
+    """
+    with _clients_lock:
+        if url in _clients:
+            return _clients[url]
+        if url.startswith('fake://'):
+            client = FakeRedis()
+        elif redis is None:
+            logger.warning("redis not installed, response cache runs without the shared tier. "
+                           "Run: pip install redis")
+            client = None
+        else:
+            client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        _clients[url] = client
+        return client
+
+
+class ResponseCache:
+    """In-process LRU in front of an optional Redis tier, holding (body, mimetype) pairs."""
+
+    def __init__(self, redis_client=None, max_entries: int = LOCAL_CACHE_SIZE, ttl: int = CACHE_TTL):
+        self.redis = redis_client
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                self._local.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        if self.redis is not None:
+            try:
+                stored = self.redis.get(KEY_PREFIX + key)
+            except Exception as e:
+                # A Redis outage only costs cache hits
+                logger.warning(f"Redis cache read failed: {e}")
+                stored = None
+            if stored is not None:
+                mimetype, _, body = stored.partition(b'\n')
+                entry = (body, mimetype.decode())
+                self._store_local(key, entry)
+                with self._lock:
+                    self.hits += 1
+                return entry
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, body: bytes, mimetype: str):
+        self._store_local(key, (body, mimetype))
+        if self.redis is not None:
+            try:
+                self.redis.set(KEY_PREFIX + key, mimetype.encode() + b'\n' + body, ex=self.ttl)
+            except Exception as e:
+                logger.warning(f"Redis cache write failed: {e}")
+
+    def clear(self):
+        """Drop the in-process tier (Redis entries expire on their own)."""
+        with self._lock:
+            self._local.clear()
+
+    def _store_local(self, key, entry):
+        with self._lock:
+            self._local[key] = entry
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def cached(self, generation_fn):
+        """
+        Decorator for Flask views whose response only depends on the data.
+
+        Args:
+            generation_fn: Returns the current data generation
+
+        Only 200 responses with a complete body are stored (not streamed ones).
+        """
+        from flask import current_app
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                key = _request_key(generation_fn())
+
+                entry = self.get(key)
+                if entry is not None:
+                    body, mimetype = entry
+                    return current_app.response_class(body, mimetype=mimetype)
+
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not (response.direct_passthrough or response.is_streamed):
+                    self.set(key, response.get_data(), response.mimetype)
+                return response
+            return wrapper
+        return decorator
+
+
+def _request_key(generation):
+    from flask import request
+    query = urlencode(sorted(request.args.items(multi=True)))
+    return f"{generation}:{request.path}?{query}"
+
+
+def conditional(generation_fn, modified_fn=None, cache_control=CACHE_CONTROL):
+    """
+    Decorator adding ETag/Last-Modified validators and 304 responses to a GET view.
+
+    Args:
+        generation_fn: Returns the current data generation
+        modified_fn: Optional; returns when the generation last changed (datetime)
+        cache_control: Cache-Control header for 200 and 304 responses
+    """
+    from flask import request, current_app
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = _request_key(generation_fn())
+            etag = hashlib.sha1(key.encode()).hexdigest()[:20]
+            modified = modified_fn() if modified_fn else None
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                not_modified = (modified is not None and request.if_modified_since is not None
+                                and modified.replace(microsecond=0) <= request.if_modified_since)
+            if not_modified:
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            # Weak: compressed and uncompressed bodies are the same representation
+            response.set_etag(etag, weak=True)
+            if modified is not None:
+                response.last_modified = modified
+            response.headers['Cache-Control'] = cache_control
+            return response
+        return wrapper
+    return decorator
+
+
+def create_response_cache() -> ResponseCache:
+    """Response cache with the Redis tier from REDIS_URL, if configured."""
+    return ResponseCache(get_redis(Config.REDIS_URL) if Config.REDIS_URL else None)
@@ -11,6 +11,10 @@ import logging
 from datetime import datetime
 import os
 import sys
+from scrapers.browser_daemon import ensure_running, cleanup_profile_dirs
+from database.sqlite import connect
+from database.archive import archive_inactive_jobs
+from database.snapshot import publish_snapshot
 
 # 获取脚本所在目录
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -34,6 +38,10 @@ def run_scraper():
     logger.info("=" * 60)
     
     try:
+        # 预热常驻Chrome守护进程，爬虫通过Remote WebDriver复用浏览器
+        if ensure_running():
+            logger.info("🔥 Warm Chrome daemon is ready")
+        
         # 切换到scrapers目录并运行爬虫
         scraper_path = os.path.join(SCRIPT_DIR, 'scrapers')
         scraper_script = 'integrated_scraper.py'
@@ -42,7 +50,7 @@ def run_scraper():
         cmd = [
             sys.executable,  # 使用当前Python解释器
             scraper_script,
-            '--sources', 'seek', 'linkedin', 'indeed', 'trademe',
+            '--sources', 'all',  # 所有在 source_registry 中注册的源
             '--fetch-descriptions'
             # 不设置 max-descriptions，抓取所有职位的JD
         ]
@@ -100,6 +108,22 @@ def run_scraper():
                     
             except Exception as e:
                 logger.error(f"❌ Error running data enrichment: {e}")
+            
+            # 归档长期不活跃的职位，保持热表小
+            try:
+                conn = connect(os.path.join(SCRIPT_DIR, 'job_scraper.db'))
+                try:
+                    archive_inactive_jobs(conn)
+                finally:
+                    conn.close()
+            except Exception as e:
+                logger.error(f"❌ Error archiving inactive jobs: {e}")
+            
+            # 重新发布只读快照，让网页读到富化后的数据
+            try:
+                publish_snapshot(os.path.join(SCRIPT_DIR, 'job_scraper.db'))
+            except Exception as e:
+                logger.error(f"❌ Error publishing read snapshot: {e}")
         else:
             logger.error(f"❌ Scraping job failed with return code: {result.returncode}")
         
@@ -111,6 +135,9 @@ def run_scraper():
         logger.error("❌ Scraping job timed out after 1 hour")
     except Exception as e:
         logger.error(f"❌ Error running scraper: {e}", exc_info=True)
+    finally:
+        # 清理本地回退模式留下的临时Chrome profile
+        cleanup_profile_dirs()
 
 def test_run():
     """测试运行（立即执行一次）"""
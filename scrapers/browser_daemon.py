@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Long-lived Chrome daemon shared by all scrapers.
+
+The daemon runs one ChromeDriver server and keeps a small pool of pre-warmed headless
+Chrome instances, each with a persistent, size-capped profile. Scrapers attach to a
+free instance over the remote WebDriver protocol instead of launching Chrome
+themselves, so per-scrape startup is a session handshake rather than a browser boot.
+
+Usage:
+    python browser_daemon.py start [--instances 1] [--idle-timeout 3600]
+    python browser_daemon.py stop | status | cleanup
+"""
+
+import os
+import sys
+import json
+import time
+import glob
+import shutil
+import signal
+import socket
+import logging
+import tempfile
+import subprocess
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no slot locking, attach_driver() always falls back
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+STATE_DIR = os.getenv('CHROME_DAEMON_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'job_scraper', 'chrome'))
+STATE_FILE = os.path.join(STATE_DIR, 'daemon.json')
+LAST_USED_FILE = os.path.join(STATE_DIR, 'last_used')
+PROFILE_ROOT = os.path.join(STATE_DIR, 'profiles')
+
+DRIVER_PORT = int(os.getenv('CHROME_DAEMON_DRIVER_PORT', 9515))
+BASE_DEBUG_PORT = int(os.getenv('CHROME_DAEMON_DEBUG_PORT', 9222))
+
+# Per-run user-data-dirs created by the scrapers' local Chrome fallback,
+# named <prefix><pid> (see each scraper's _setup_driver)
+TEMP_PROFILE_PREFIXES = ('selenium_chrome_', 'selenium_trademe_', 'selenium_indeed_', 'selenium_linkedin_')
+
+# Profile subdirectories that are safe to drop when a profile grows past its cap
+CACHE_SUBDIRS = [
+    os.path.join('Default', 'Cache'),
+    os.path.join('Default', 'Code Cache'),
+    os.path.join('Default', 'Service Worker', 'CacheStorage'),
+    'GrShaderCache',
+    'ShaderCache',
+]
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process is still running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _dir_size(path: str) -> int:
+    """Total size in bytes of all files under a directory."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total
+
+
+def read_state() -> Optional[Dict]:
+    """Return the running daemon's state, or None if no daemon is alive."""
+    try:
+        with open(STATE_FILE) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not _pid_alive(state.get('pid', -1)):
+        return None
+    return state
+
+
+def cleanup_profile_dirs(max_age_hours: float = 24, keep_slots: Optional[int] = None) -> int:
+    """
+    Remove stale Chrome profile directories.
+
+    Deletes the `selenium_chrome_<pid>`-style user-data-dirs (TEMP_PROFILE_PREFIXES)
+    left in the temp directory by the scrapers' local fallback once their process is
+    gone. Matching names without a pid suffix are removed once they are older than
+    max_age_hours. When keep_slots is given, daemon profile slots beyond it are
+    removed as well.
+
+    Returns:
+        Number of directories removed
+    """
+    removed = 0
+    cutoff = time.time() - max_age_hours * 3600
+
+    temp_dir = tempfile.gettempdir()
+    candidates = [path for prefix in TEMP_PROFILE_PREFIXES
+                  for path in glob.glob(os.path.join(temp_dir, glob.escape(prefix) + '*'))]
+    for path in candidates:
+        if not os.path.isdir(path):
+            continue
+        pid_suffix = path.rsplit('_', 1)[-1]
+        if pid_suffix.isdigit():
+            # A running scraper keeps its profile however long it runs
+            stale = not _pid_alive(int(pid_suffix))
+        else:
+            # Without a pid we can't tell whether a scraper still uses it
+            try:
+                stale = os.path.getmtime(path) < cutoff
+            except OSError:
+                continue
+        if stale:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+
+    for path in glob.glob(os.path.join(PROFILE_ROOT, 'slot-*')) if keep_slots is not None else []:
+        slot = path.rsplit('-', 1)[-1]
+        if slot.isdigit() and int(slot) >= keep_slots:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+
+    if removed:
+        logger.info(f"🧹 Removed {removed} stale Chrome profile directories")
+    return removed
+
+
+def trim_profile(profile_dir: str, cap_bytes: int) -> bool:
+    """
+    Keep a profile under its size cap by dropping caches, then the whole profile.
+    Only call this while no Chrome is using the profile.
+
+    Returns:
+        True if anything was deleted
+    """
+    if not os.path.isdir(profile_dir) or _dir_size(profile_dir) <= cap_bytes:
+        return False
+
+    for subdir in CACHE_SUBDIRS:
+        shutil.rmtree(os.path.join(profile_dir, subdir), ignore_errors=True)
+
+    if _dir_size(profile_dir) > cap_bytes:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+    logger.info(f"✂️ Trimmed Chrome profile {profile_dir}")
+    return True
+
+
+def _lock_path(slot: int) -> str:
+    return os.path.join(STATE_DIR, f'slot-{slot}.lock')
+
+
+def _try_lock(slot: int):
+    """Take the exclusive lease on a slot; returns the open lock file or None."""
+    if fcntl is None:
+        return None
+    lock_file = open(_lock_path(slot), 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return lock_file
+    except OSError:
+        lock_file.close()
+        return None
+
+
+def _slot_in_use(slot: int) -> bool:
+    lock_file = _try_lock(slot)
+    if lock_file is None:
+        return fcntl is not None
+    lock_file.close()
+    return False
+
+
+def attach_driver(window_size=None):
+    """
+    Attach to a free pre-warmed Chrome instance from the daemon.
+
+    Args:
+        window_size: Optional (width, height) to apply to the attached browser
+
+    Returns:
+        A Remote WebDriver whose quit() releases the instance back to the pool,
+        or None when no daemon is running or every instance is busy
+    """
+    state = read_state()
+    if not state:
+        return None
+
+    try:
+        from selenium import webdriver
+    except ImportError:
+        return None
+
+    class LeasedDriver(webdriver.Remote):
+        """Remote driver that hands its Chrome instance back instead of closing it."""
+
+        lease = None
+
+        def quit(self):
+            try:
+                self.get('about:blank')
+                super().quit()
+            except Exception as e:
+                logger.debug(f"Error ending daemon session: {e}")
+            finally:
+                if self.lease:
+                    self.lease.close()
+                    self.lease = None
+
+    for slot in state['slots']:
+        lease = _try_lock(slot['slot'])
+        if lease is None:
+            continue
+
+        try:
+            options = webdriver.ChromeOptions()
+            options.debugger_address = f"127.0.0.1:{slot['debug_port']}"
+            driver = LeasedDriver(command_executor=state['driver_url'], options=options)
+        except Exception as e:
+            lease.close()
+            logger.warning(f"Could not attach to Chrome slot {slot['slot']}: {e}")
+            continue
+
+        driver.lease = lease
+        with open(LAST_USED_FILE, 'a'):
+            os.utime(LAST_USED_FILE)
+        if window_size:
+            driver.set_window_size(*window_size)
+
+        logger.info(f"Attached to warm Chrome slot {slot['slot']}")
+        return driver
+
+    logger.info("All warm Chrome instances are busy, launching a local browser")
+    return None
+
+
+def ensure_running(instances: int = 1, idle_timeout: int = 3600) -> bool:
+    """Start the daemon in the background unless one is already running."""
+    if read_state():
+        return True
+
+    cmd = [sys.executable, os.path.abspath(__file__), 'start',
+           '--instances', str(instances), '--idle-timeout', str(idle_timeout)]
+    subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     start_new_session=True)
+
+    # Wait for the state file so the next scrape can attach
+    for _ in range(30):
+        if read_state():
+            return True
+        time.sleep(0.5)
+
+    logger.warning("Chrome daemon did not come up, scrapers will launch their own browser")
+    return False
+
+
+class BrowserDaemon:
+    """Supervises ChromeDriver plus a pool of pre-warmed Chrome instances."""
+
+    def __init__(self, instances: int = 1, idle_timeout: int = 3600,
+                 profile_cap_mb: int = 200, check_interval: int = 15):
+        self.instances = instances
+        self.idle_timeout = idle_timeout
+        self.profile_cap_bytes = profile_cap_mb * 1024 * 1024
+        self.check_interval = check_interval
+        self.driver_process = None
+        self.chrome_processes: Dict[int, subprocess.Popen] = {}
+        self.running = False
+
+    def _find_binary(self, names: List[str]) -> Optional[str]:
+        for name in names:
+            path = shutil.which(name)
+            if path:
+                return path
+        return None
+
+    def _wait_for_port(self, port: int, timeout: float = 15) -> bool:
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with socket.socket() as sock:
+                sock.settimeout(0.5)
+                if sock.connect_ex(('127.0.0.1', port)) == 0:
+                    return True
+            time.sleep(0.2)
+        return False
+
+    def _profile_dir(self, slot: int) -> str:
+        return os.path.join(PROFILE_ROOT, f'slot-{slot}')
+
+    def _start_driver(self):
+        chromedriver = self._find_binary(['chromedriver'])
+        if not chromedriver:
+            raise RuntimeError("chromedriver not found on PATH")
+        self.driver_process = subprocess.Popen(
+            [chromedriver, f'--port={DRIVER_PORT}'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        if not self._wait_for_port(DRIVER_PORT):
+            raise RuntimeError(f"chromedriver did not start on port {DRIVER_PORT}")
+
+    def _start_chrome(self, slot: int):
+        chrome = self._find_binary(['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser'])
+        if not chrome:
+            raise RuntimeError("Chrome not found on PATH")
+
+        profile_dir = self._profile_dir(slot)
+        trim_profile(profile_dir, self.profile_cap_bytes)
+        os.makedirs(profile_dir, exist_ok=True)
+
+        debug_port = BASE_DEBUG_PORT + slot
+        args = [
+            chrome,
+            '--headless',
+            f'--remote-debugging-port={debug_port}',
+            f'--user-data-dir={profile_dir}',
+            # Chrome enforces the HTTP cache part of the cap itself
+            f'--disk-cache-size={self.profile_cap_bytes // 2}',
+            '--no-sandbox',
+            '--disable-dev-shm-usage',
+            '--disable-gpu',
+            '--disable-extensions',
+            '--disable-background-networking',
+            '--disable-background-timer-throttling',
+            '--disable-renderer-backgrounding',
+            '--disable-breakpad',
+            '--disable-sync',
+            '--no-first-run',
+            '--no-default-browser-check',
+            '--password-store=basic',
+            '--use-mock-keychain',
+            '--disable-blink-features=AutomationControlled',
+            f'--user-agent={USER_AGENT}',
+            '--window-size=1920,1080',
+            'about:blank',
+        ]
+        self.chrome_processes[slot] = subprocess.Popen(
+            args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        if not self._wait_for_port(debug_port):
+            raise RuntimeError(f"Chrome slot {slot} did not open port {debug_port}")
+        logger.info(f"🔥 Chrome slot {slot} warm on port {debug_port}")
+
+    def _stop_chrome(self, slot: int):
+        process = self.chrome_processes.pop(slot, None)
+        if process and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def _write_state(self):
+        state = {
+            'pid': os.getpid(),
+            'driver_url': f'http://127.0.0.1:{DRIVER_PORT}',
+            'slots': [
+                {'slot': slot, 'debug_port': BASE_DEBUG_PORT + slot}
+                for slot in sorted(self.chrome_processes)
+            ],
+            'started_at': time.time(),
+        }
+        tmp_path = STATE_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, STATE_FILE)
+
+    def _idle_seconds(self) -> float:
+        try:
+            last_used = os.path.getmtime(LAST_USED_FILE)
+        except OSError:
+            return 0
+        return time.time() - last_used
+
+    def _supervise(self):
+        """Restart crashed instances and recycle idle ones that outgrew their cap."""
+        if self.driver_process.poll() is not None:
+            logger.warning("chromedriver exited, restarting")
+            self._start_driver()
+
+        for slot in range(self.instances):
+            process = self.chrome_processes.get(slot)
+            if process is None or process.poll() is not None:
+                logger.warning(f"Chrome slot {slot} exited, restarting")
+                self._start_chrome(slot)
+            elif (not _slot_in_use(slot)
+                  and _dir_size(self._profile_dir(slot)) > self.profile_cap_bytes):
+                lease = _try_lock(slot)
+                if lease is None:
+                    continue
+                try:
+                    self._stop_chrome(slot)
+                    self._start_chrome(slot)
+                finally:
+                    lease.close()
+
+    def start(self):
+        """Start ChromeDriver and the Chrome pool, then supervise until idle or stopped."""
+        if read_state():
+            logger.info("Chrome daemon already running")
+            return
+
+        os.makedirs(PROFILE_ROOT, exist_ok=True)
+        cleanup_profile_dirs(keep_slots=self.instances)
+
+        signal.signal(signal.SIGTERM, lambda *_: self._request_stop())
+        signal.signal(signal.SIGINT, lambda *_: self._request_stop())
+
+        try:
+            self._start_driver()
+            for slot in range(self.instances):
+                self._start_chrome(slot)
+            with open(LAST_USED_FILE, 'a'):
+                os.utime(LAST_USED_FILE)
+            self._write_state()
+            logger.info(f"✅ Chrome daemon ready with {self.instances} instance(s)")
+
+            self.running = True
+            while self.running:
+                time.sleep(self.check_interval)
+                busy = any(_slot_in_use(slot) for slot in range(self.instances))
+                if not busy and self._idle_seconds() > self.idle_timeout:
+                    logger.info(f"💤 Idle for {self.idle_timeout}s, shutting down")
+                    break
+                self._supervise()
+                cleanup_profile_dirs(keep_slots=self.instances)
+        finally:
+            self.shutdown()
+
+    def _request_stop(self):
+        self.running = False
+
+    def shutdown(self):
+        """Stop every Chrome instance and ChromeDriver, and remove the state file."""
+        for slot in list(self.chrome_processes):
+            self._stop_chrome(slot)
+        if self.driver_process and self.driver_process.poll() is None:
+            self.driver_process.terminate()
+        try:
+            os.remove(STATE_FILE)
+        except OSError:
+            pass
+
+
+def stop_daemon() -> bool:
+    """Ask a running daemon to shut down."""
+    state = read_state()
+    if not state:
+        return False
+    os.kill(state['pid'], signal.SIGTERM)
+    return True
+
+
+def main():
+    """Command line entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Warm Chrome daemon for the scrapers')
+    parser.add_argument('command', choices=['start', 'stop', 'status', 'cleanup'])
+    parser.add_argument('--instances', type=int, default=1,
+                        help='Number of pre-warmed Chrome instances (default: 1)')
+    parser.add_argument('--idle-timeout', type=int, default=3600,
+                        help='Shut down after this many idle seconds (default: 3600)')
+    parser.add_argument('--profile-cap-mb', type=int, default=200,
+                        help='Size cap per persistent profile in MB (default: 200)')
+    parser.add_argument('--max-age-hours', type=float, default=24,
+                        help='Age after which temp profiles are removed by cleanup (default: 24)')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    if args.command == 'start':
+        try:
+            BrowserDaemon(
+                instances=args.instances,
+                idle_timeout=args.idle_timeout,
+                profile_cap_mb=args.profile_cap_mb
+            ).start()
+        except RuntimeError as e:
+            logger.error(f"❌ Chrome daemon failed to start: {e}")
+            sys.exit(1)
+    elif args.command == 'stop':
+        print("Stopped" if stop_daemon() else "Not running")
+    elif args.command == 'status':
+        state = read_state()
+        print(json.dumps(state, indent=2) if state else "Not running")
+    elif args.command == 'cleanup':
+        cleanup_profile_dirs(max_age_hours=args.max_age_hours)
+
+
+if __name__ == '__main__':
+    main()
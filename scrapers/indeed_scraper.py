@@ -9,6 +9,15 @@ import re
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 
+try:
+    from .browser_daemon import attach_driver
+    from .url_canonical import stable_job_id
+    from .scrape_metrics import ScrapeMetrics
+except ImportError:
+    from browser_daemon import attach_driver
+    from url_canonical import stable_job_id
+    from scrape_metrics import ScrapeMetrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,6 +27,7 @@ class IndeedScraper:
     def __init__(self):
         self.base_url = "https://nz.indeed.com"
         self.driver = None
+        self.metrics = ScrapeMetrics()
         
     def _setup_driver(self):
         """Setup Selenium driver with anti-detection measures."""
@@ -40,7 +50,8 @@ class IndeedScraper:
             user_data_dir = os.path.join(tempfile.gettempdir(), f'selenium_indeed_{os.getpid()}')
             chrome_options.add_argument(f'--user-data-dir={user_data_dir}')
             
-            self.driver = webdriver.Chrome(options=chrome_options)
+            # Prefer a pre-warmed browser from the Chrome daemon, fall back to a local one
+            self.driver = attach_driver(window_size=(1920, 1080)) or webdriver.Chrome(options=chrome_options)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             self.driver.set_page_load_timeout(30)
             self.driver.implicitly_wait(5)
@@ -57,7 +68,10 @@ class IndeedScraper:
     
     def scrape_jobs(self, max_pages: int = 20) -> List[Dict]:
         """Scrape IT jobs from Indeed NZ."""
-        if not self._setup_driver():
+        self.metrics = ScrapeMetrics()
+        with self.metrics.phase('driver_startup'):
+            driver_ready = self._setup_driver()
+        if not driver_ready:
             return []
         
         try:
@@ -86,8 +100,10 @@ class IndeedScraper:
                         page_url = f"{search_url}&start={page * 10}"
                         logger.info(f"Scraping Indeed page {page + 1}: {page_url}")
                         
-                        self.driver.get(page_url)
+                        with self.metrics.phase('listing_pages'):
+                            self.driver.get(page_url)
                         time.sleep(random.uniform(2, 4))
+                        self.metrics.pages += 1
                         
                         # Wait for job cards
                         try:
@@ -95,9 +111,10 @@ class IndeedScraper:
                             from selenium.webdriver.support import expected_conditions as EC
                             from selenium.webdriver.common.by import By
                             
-                            WebDriverWait(self.driver, 10).until(
-                                EC.presence_of_element_located((By.CSS_SELECTOR, "div.job_seen_beacon, div.slider_item"))
-                            )
+                            with self.metrics.phase('listing_pages'):
+                                WebDriverWait(self.driver, 10).until(
+                                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.job_seen_beacon, div.slider_item"))
+                                )
                         except:
                             logger.warning(f"No job listings found on Indeed page {page + 1}")
                             consecutive_empty_pages += 1
@@ -106,8 +123,9 @@ class IndeedScraper:
                             page += 1
                             continue
                         
-                        page_source = self.driver.page_source
-                        page_jobs = self._parse_job_listings(page_source)
+                        with self.metrics.phase('parse'):
+                            page_source = self.driver.page_source
+                            page_jobs = self._parse_job_listings(page_source)
                         
                         if page_jobs:
                             jobs.extend(page_jobs)
@@ -199,7 +217,7 @@ class IndeedScraper:
             salary = salary_elem.get_text(strip=True) if salary_elem else ""
             
             job = {
-                'external_id': f"indeed_{job_key}" if job_key else f"indeed_{hash(url)}",
+                'external_id': f"indeed_{job_key}" if job_key else stable_job_id(url, 'indeed'),
                 'title': title,
                 'company': company,
                 'location': location,
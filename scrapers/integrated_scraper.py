@@ -4,14 +4,29 @@ Integrated scraper that combines multiple job sources.
 Supports: Seek, LinkedIn, Indeed, TradeMe
 """
 
+import os
 import sys
+import time
 import logging
-import sqlite3
 from datetime import datetime
-from seek_scraper import SeekScraper
-from linkedin_scraper import LinkedInScraper
-from indeed_scraper import IndeedScraper
-from trademe_scraper import TradeMeScraper
+
+# Make the project root importable when run as a script from scrapers/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from database.sqlite import connect
+from database.backends import get_backend
+from database.migrations import migrate
+from database.descriptions import store_descriptions, maybe_train_dictionary
+from database.archive import restore_jobs
+from database.snapshot import publish_snapshot
+from database.rollups import refresh_rollups
+from database.generation import bump_generation
+from database.job_history import TRACKED_FIELDS, diff_fields, write_snapshots
+from source_registry import available_sources, get_plugin
+from url_canonical import canonicalize_url
+from scrape_metrics import ScrapeMetrics
 
 # Setup logging
 logging.basicConfig(
@@ -21,34 +36,49 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# A scraped job without any of these can't be stored (jobs.title and company are NOT NULL)
+REQUIRED_JOB_FIELDS = ('external_id', 'url', 'title', 'company')
+
 class IntegratedScraper:
     """Integrated scraper that collects jobs from multiple sources."""
     
     def __init__(self, db_path=None, sources=None):
+        """
+        Args:
+            db_path: SQLite file (default: job_scraper.db in the project root), or an
+                explicit postgresql:// URL to ingest into Postgres instead
+            sources: Source names to scrape (default: all registered sources)
+        """
         # 使用绝对路径，确保爬虫和Flask使用同一个数据库
         if db_path is None:
-            import os
-            # 获取项目根目录（scrapers的父目录）
-            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            db_path = os.path.join(project_root, 'job_scraper.db')
+            # 项目根目录（scrapers的父目录）
+            db_path = os.path.join(PROJECT_ROOT, 'job_scraper.db')
         self.db_path = db_path
-        logger.info(f"Using database: {self.db_path}")
         
-        # Initialize scrapers for requested sources
+        # None means the built-in SQLite ingest below
+        self.backend = get_backend(db_path)
+        logger.info(f"Using database: {self.backend or self.db_path}")
+        if self.backend:
+            # The web app, enrichment, search, rollups and history all read the SQLite file
+            logger.warning("⚠️  Ingesting into a server database: the dashboard, enrichment, "
+                           "job history and scrape logs keep using SQLite and won't see this data")
+        
+        # Scrapers are created lazily, the first time a source is scraped
         self.scrapers = {}
         if sources is None:
-            sources = ['seek', 'linkedin', 'indeed', 'trademe']
-        
-        if 'seek' in sources:
-            self.scrapers['seek'] = SeekScraper()
-        if 'linkedin' in sources:
-            self.scrapers['linkedin'] = LinkedInScraper()
-        if 'indeed' in sources:
-            self.scrapers['indeed'] = IndeedScraper()
-        if 'trademe' in sources:
-            self.scrapers['trademe'] = TradeMeScraper()
-        
-        logger.info(f"Initialized scrapers for: {', '.join(self.scrapers.keys())}")
+            sources = available_sources()
+        self.sources = [get_plugin(name).name for name in sources]
+        
+        # Run id and per-source counts of the last SQLite ingest (for scrape_logs)
+        self.last_ingest = None
+        
+        logger.info(f"Selected sources: {', '.join(self.sources)}")
+    
+    def _get_scraper(self, source_name):
+        """Return the scraper for a source, importing and creating it on first use."""
+        if source_name not in self.scrapers:
+            self.scrapers[source_name] = get_plugin(source_name).create()
+        return self.scrapers[source_name]
     
     def scrape_and_save(self, sources=None, fetch_descriptions=False, max_descriptions=None):
         """Scrape jobs from multiple sources and save to database.
@@ -60,187 +90,506 @@ class IntegratedScraper:
         """
         logger.info("🚀 Starting integrated multi-source scraping...")
         
+        started_at = datetime.now().isoformat()
         all_jobs = []
+        # Sources that actually returned jobs; only these get stale jobs deactivated
+        completed_sources = []
+        # One scrape_logs row per source attempted
+        source_logs = []
         
         # Determine which sources to scrape
         if sources is None:
-            sources = list(self.scrapers.keys())
+            sources = self.sources
         
         try:
             # Scrape from each source
             for source_name in sources:
-                if source_name not in self.scrapers:
-                    logger.warning(f"Scraper for '{source_name}' not initialized, skipping")
+                if source_name not in self.sources:
+                    logger.warning(f"Source '{source_name}' not selected, skipping")
                     continue
                 
                 logger.info(f"\n📡 Scraping from {source_name.upper()}...")
-                scraper = self.scrapers[source_name]
+                plugin = get_plugin(source_name)
+                log = {'source': source_name, 'jobs_found': 0, 'status': 'error',
+                       'error_message': None, 'metrics': None}
+                source_logs.append(log)
+                source_started = time.perf_counter()
                 
                 try:
-                    # Different scrapers may have different optimal page limits
-                    if source_name == 'seek':
+                    scraper = self._get_scraper(source_name)
+                    
+                    # Each source declares its own optimal page limit
+                    if plugin.descriptions:
                         # Keep driver open if we need to fetch descriptions
-                        jobs = scraper.scrape_jobs(max_pages=999, keep_driver=fetch_descriptions)
-                    elif source_name == 'linkedin':
-                        jobs = scraper.scrape_jobs(max_pages=5)  # LinkedIn is slower
-                    elif source_name == 'indeed':
-                        jobs = scraper.scrape_jobs(max_pages=10)
-                    elif source_name == 'trademe':
-                        jobs = scraper.scrape_jobs(max_pages=10)
+                        jobs = scraper.scrape_jobs(max_pages=plugin.max_pages, keep_driver=fetch_descriptions)
                     else:
-                        jobs = scraper.scrape_jobs()
+                        jobs = scraper.scrape_jobs(max_pages=plugin.max_pages)
                     
                     logger.info(f"✅ {source_name.upper()}: Found {len(jobs)} jobs")
                     
-                    # Fetch descriptions if requested (currently only for Seek)
-                    if fetch_descriptions and source_name == 'seek' and hasattr(scraper, 'enrich_jobs_with_descriptions'):
+                    # Fetch descriptions if requested and supported by the source
+                    if fetch_descriptions and plugin.descriptions:
                         logger.info(f"\n📄 Fetching job descriptions for {source_name.upper()}...")
-                        jobs = scraper.enrich_jobs_with_descriptions(jobs, max_jobs=max_descriptions)
+                        # Conditional re-validation needs the HTTP detail path
+                        validators = self._load_description_validators(source_name) if plugin.http_mode else None
+                        jobs = scraper.enrich_jobs_with_descriptions(
+                            jobs, max_jobs=max_descriptions, validators=validators
+                        )
                         # Close driver after fetching descriptions
                         if hasattr(scraper, 'close_driver'):
                             scraper.close_driver()
                     
                     all_jobs.extend(jobs)
+                    log['jobs_found'] = len(jobs)
+                    if jobs:
+                        completed_sources.append(source_name)
+                        log['status'] = 'success'
+                    else:
+                        log['error_message'] = 'No jobs found'
                     
                 except Exception as e:
                     logger.error(f"❌ {source_name.upper()} scraping failed: {e}")
+                    log['error_message'] = str(e)
                     continue
+                finally:
+                    log['duration_seconds'] = time.perf_counter() - source_started
+                    log['metrics'] = getattr(self.scrapers.get(source_name), 'metrics', None)
             
             logger.info(f"\n📊 Total jobs collected from all sources: {len(all_jobs)}")
             
             if not all_jobs:
                 logger.warning("No jobs found from any source")
+                self._write_scrape_logs(source_logs)
+                self._publish_snapshot()
                 return
             
             # Save to database
-            saved_count = self._save_jobs_to_db(all_jobs)
+            write_started = time.perf_counter()
+            saved_count = self._save_jobs_to_db(all_jobs, started_at=started_at, sources=completed_sources)
             logger.info(f"💾 Saved {saved_count} new jobs to database")
+            self._write_scrape_logs(source_logs, db_write_seconds=time.perf_counter() - write_started)
+            self._refresh_rollups()
+            self._publish_snapshot()
             
         except Exception as e:
             logger.error(f"Integrated scraping failed: {e}")
             raise
     
-    def _save_jobs_to_db(self, jobs):
-        """Save jobs to database with smart deduplication and status tracking."""
-        conn = sqlite3.connect(self.db_path)
+    def _write_scrape_logs(self, source_logs, db_write_seconds=0.0):
+        """Record one scrape_logs row per source with its counts and phase timings.
+        
+        All sources are merged in one batch, so each source that returned jobs is
+        charged the whole batch write time as its db_write phase.
+        """
+        if self.backend:
+            logger.debug("scrape_logs are only kept in the SQLite database, skipping")
+            return
+        
+        ingest = self.last_ingest or {'run_id': None, 'sources': {}}
+        timestamp = datetime.now().isoformat()
+        rows = []
+        for log in source_logs:
+            metrics = log['metrics'] or ScrapeMetrics()
+            counts = ingest['sources'].get(log['source'], {})
+            if log['status'] == 'success':
+                metrics.durations['db_write'] = db_write_seconds
+            rows.append((
+                log['source'], timestamp, log['jobs_found'],
+                counts.get('new', 0), counts.get('updated', 0), counts.get('removed', 0),
+                log['status'], log['error_message'],
+                round(log['duration_seconds'] + metrics.durations['db_write'], 2),
+                ingest['run_id'] if log['status'] == 'success' else None,
+                metrics.pages, metrics.pages_per_second(),
+                *(round(metrics.durations[name], 3) for name in
+                  ('driver_startup', 'listing_pages', 'detail_fetches', 'parse', 'db_write')),
+            ))
+            logger.info(f"⏱️  {log['source'].upper()}: {metrics!r}")
+        
+        conn = connect(self.db_path)
+        try:
+            migrate(conn)
+            conn.executemany('''
+                INSERT INTO scrape_logs (
+                    source, timestamp, jobs_found, jobs_new, jobs_updated, jobs_removed,
+                    status, error_message, duration_seconds, run_id, pages, pages_per_second,
+                    driver_startup_seconds, listing_seconds, detail_seconds, parse_seconds,
+                    db_write_seconds
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to write scrape logs: {e}")
+        finally:
+            conn.close()
+    
+    def _refresh_rollups(self):
+        """Bring the analytics rollup tables up to date with the saved run."""
+        if self.backend:
+            logger.debug("Analytics rollups are only kept in the SQLite database, skipping")
+            return
+        conn = connect(self.db_path)
+        try:
+            refresh_rollups(conn)
+        except Exception as e:
+            # The dashboard keeps showing the previous figures
+            logger.error(f"Failed to refresh analytics rollups: {e}")
+        finally:
+            conn.close()
+    
+    def _publish_snapshot(self):
+        """Publish the read-only snapshot the web app serves from and bump the data generation."""
+        if self.backend:
+            # No snapshot for server databases, but cached responses are stale all the same
+            bump_generation()
+            return
+        try:
+            publish_snapshot(self.db_path)
+        except Exception as e:
+            # Readers keep using the previous snapshot
+            logger.error(f"Failed to publish read snapshot: {e}")
+    
+    def _load_description_validators(self, source):
+        """Load stored description hashes and HTTP validators for a source, keyed by external_id."""
+        if self.backend:
+            return self.backend.load_description_validators(source)
+        
+        conn = connect(self.db_path)
+        try:
+            migrate(conn)
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT external_id, description_hash, etag, last_modified
+                FROM jobs
+                WHERE source = ? AND description_hash IS NOT NULL
+            ''', (source,))
+            
+            return {
+                external_id: {
+                    'description_hash': description_hash,
+                    'etag': etag,
+                    'last_modified': last_modified
+                }
+                for external_id, description_hash, etag, last_modified in cursor.fetchall()
+            }
+        finally:
+            conn.close()
+    
+    def _save_jobs_to_db(self, jobs, started_at=None, sources=None):
+        """Save jobs to database with smart deduplication and status tracking.
+        
+        The batch is loaded into a temp table with executemany and merged with
+        set-based statements, so the cost no longer grows with one query per job.
+        Each call is recorded as an ingest run; new jobs are tagged with its id.
+        
+        Args:
+            jobs: Scraped job dictionaries
+            started_at: When scraping for this run started
+            sources: Sources that were scraped successfully (default: sources present
+                in jobs). Only their unseen jobs are marked inactive.
+        """
+        if sources is None:
+            sources = sorted({job.get('source', 'seek') for job in jobs})
+        
+        if self.backend:
+            now = datetime.now().isoformat()
+            counts = self.backend.save_jobs(self._incoming_rows(jobs, now), sources, started_at or now)
+            logger.info(f"📊 Summary: {counts['new']} new jobs, {counts['updated']} updated jobs, "
+                        f"{counts['changed_descriptions']} changed descriptions, "
+                        f"{counts['inactive']} marked inactive")
+            return counts['new']
+        
+        conn = connect(self.db_path)
+        migrate(conn)
         cursor = conn.cursor()
         
-        # Create table if it doesn't exist
+        now = datetime.now().isoformat()
+        today = datetime.now().date().isoformat()
+        
+        cursor.execute(
+            "INSERT INTO ingest_runs (started_at, sources) VALUES (?, ?)",
+            (started_at or now, ','.join(sources))
+        )
+        run_id = cursor.lastrowid
+        
+        self._load_incoming_jobs(cursor, jobs, now)
+        
+        # Archived jobs that are back on the boards rejoin the hot table with their history
+        restore_jobs(cursor, 'incoming_jobs')
+        
+        # Jobs whose external_id changed but whose canonical URL we already know keep their row
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS jobs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                external_id TEXT UNIQUE,
-                title TEXT NOT NULL,
-                company TEXT NOT NULL,
-                location TEXT,
-                salary_range TEXT,
-                job_type TEXT,
-                description TEXT,
-                url TEXT UNIQUE,
-                category TEXT,
-                skills TEXT,
-                source TEXT DEFAULT 'seek',
-                first_seen_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_seen_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                is_active BOOLEAN DEFAULT 1,
-                is_new_today BOOLEAN DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            UPDATE incoming_jobs
+            SET external_id = (SELECT j.external_id FROM jobs j WHERE j.canonical_url = incoming_jobs.canonical_url)
+            WHERE external_id NOT IN (SELECT external_id FROM jobs WHERE external_id IS NOT NULL)
+              AND canonical_url IN (SELECT canonical_url FROM jobs WHERE canonical_url IS NOT NULL)
+        ''')
+        
+        # Existing jobs seen for the first time today
+        updated_by_source = dict(cursor.execute('''
+            SELECT j.source, COUNT(*) FROM jobs j
+            JOIN incoming_jobs i ON i.external_id = j.external_id
+            WHERE j.last_seen_date IS NULL OR j.last_seen_date < ?
+            GROUP BY j.source
+        ''', (today,)).fetchall())
+        updated_count = sum(updated_by_source.values())
+        
+        # Record field-level history and apply changed fields before the description merge
+        changed_jobs = self._track_changes(cursor, now)
+        
+        # Only rewrite descriptions whose content actually changed
+        changed_description_rows = cursor.execute('''
+            SELECT j.id, i.description
+            FROM jobs j
+            JOIN incoming_jobs i ON i.external_id = j.external_id
+            WHERE i.description_hash IS NOT NULL
+              AND i.description_hash IS NOT j.description_hash
+        ''').fetchall()
+        cursor.execute('''
+            UPDATE jobs
+            SET description_hash = i.description_hash,
+                etag = i.etag,
+                last_modified = i.last_modified,
+                updated_at = i.seen_at
+            FROM incoming_jobs i
+            WHERE jobs.external_id = i.external_id
+              AND i.description_hash IS NOT NULL
+              AND i.description_hash IS NOT jobs.description_hash
+        ''')
+        changed_descriptions = cursor.rowcount
+        store_descriptions(cursor, changed_description_rows)
+        
+        # Unchanged pages may still come back with fresh validators
+        cursor.execute('''
+            UPDATE jobs
+            SET etag = i.etag,
+                last_modified = i.last_modified
+            FROM incoming_jobs i
+            WHERE jobs.external_id = i.external_id
+              AND i.description_unchanged = 1
+              AND (i.etag IS NOT jobs.etag OR i.last_modified IS NOT jobs.last_modified)
+        ''')
+        
+        # Insert new jobs (标记为今日新增) and refresh last-seen for known ones
+        cursor.execute('''
+            INSERT OR IGNORE INTO jobs (
+                external_id, title, company, location,
+                url, canonical_url, category, job_type, salary_range, skills, 
+                source, first_seen_date, last_seen_date, first_seen_run_id,
+                description_hash, etag, last_modified
             )
+            SELECT external_id, title, company, location,
+                   url, canonical_url, category, job_type, salary_range, '',
+                   source, seen_at, seen_at, ?,
+                   description_hash, etag, last_modified
+            FROM incoming_jobs
+            WHERE true
+            ON CONFLICT(external_id) DO UPDATE SET
+                last_seen_date = excluded.last_seen_date,
+                is_active = 1,
+                updated_at = excluded.last_seen_date
+            WHERE jobs.last_seen_date IS NULL OR jobs.last_seen_date < ?
+        ''', (run_id, today))
+        
+        # New jobs are the rows this run actually inserted
+        new_by_source = dict(cursor.execute('''
+            SELECT source, COUNT(*) FROM jobs
+            WHERE first_seen_run_id = ?
+            GROUP BY source
+        ''', (run_id,)).fetchall())
+        new_count = sum(new_by_source.values())
+        
+        # Full descriptions of new jobs go to the compressed side table
+        store_descriptions(cursor, cursor.execute('''
+            SELECT j.id, i.description
+            FROM incoming_jobs i
+            JOIN jobs j ON j.external_id = i.external_id
+            WHERE j.first_seen_run_id = ? AND i.description != ''
+        ''', (run_id,)).fetchall())
+        
+        jobs_seen = cursor.execute('SELECT COUNT(*) FROM incoming_jobs').fetchone()[0]
+        
+        inactive_by_source = self._deactivate_unseen_jobs(cursor, sources, today, now)
+        inactive_count = sum(inactive_by_source.values())
+        cursor.execute('DROP TABLE incoming_jobs')
+        
+        # Finishing the run in the same transaction makes it "latest" atomically
+        cursor.execute('''
+            UPDATE ingest_runs SET finished_at = ?, jobs_seen = ?, jobs_new = ? WHERE id = ?
+        ''', (datetime.now().isoformat(), jobs_seen, new_count, run_id))
+        
+        maybe_train_dictionary(cursor)
+        
+        conn.commit()
+        conn.close()
+        
+        self.last_ingest = {
+            'run_id': run_id,
+            'sources': {
+                source: {
+                    'new': new_by_source.get(source, 0),
+                    'updated': updated_by_source.get(source, 0),
+                    'removed': inactive_by_source.get(source, 0),
+                }
+                for source in {*new_by_source, *updated_by_source, *inactive_by_source}
+            },
+        }
+        
+        logger.info(f"📊 Summary: {new_count} new jobs, {updated_count} updated jobs, "
+                    f"{changed_jobs} changed jobs, {changed_descriptions} changed descriptions, "
+                    f"{inactive_count} marked inactive")
+        return new_count
+    
+    def _track_changes(self, cursor, now):
+        """Write delta snapshots for existing jobs whose tracked fields changed.
+        
+        Candidates are found with one join against incoming_jobs; only those rows are
+        diffed in Python. Changed fields other than the description hash are applied
+        to the job here (the description itself is merged afterwards).
+        
+        Returns:
+            Number of jobs with recorded changes
+        """
+        differs = ' OR '.join(
+            f"(NULLIF(i.{field}, '') IS NOT NULL AND i.{field} IS NOT j.{field})" for field in TRACKED_FIELDS
+        )
+        stored_columns = ', '.join(f"j.{field}" for field in TRACKED_FIELDS)
+        incoming_columns = ', '.join(f"i.{field}" for field in TRACKED_FIELDS)
+        cursor.execute(f'''
+            SELECT j.id, {stored_columns}, {incoming_columns}
+            FROM incoming_jobs i
+            JOIN jobs j ON j.external_id = i.external_id
+            WHERE {differs}
         ''')
         
-        # 每次运行前，将所有is_new_today重置为0
-        cursor.execute('UPDATE jobs SET is_new_today = 0')
+        width = len(TRACKED_FIELDS)
+        changed_jobs = []
+        for row in cursor.fetchall():
+            stored = dict(zip(TRACKED_FIELDS, row[1:1 + width]))
+            incoming = dict(zip(TRACKED_FIELDS, row[1 + width:]))
+            changes = diff_fields(stored, incoming)
+            if changes:
+                changed_jobs.append((row[0], stored, changes))
         
-        today = datetime.now().date().isoformat()
-        new_count = 0
-        updated_count = 0
+        if not changed_jobs:
+            return 0
         
-        # Get all current active job URLs to mark inactive ones
-        scraped_urls = {job['url'] for job in jobs}
+        write_snapshots(cursor, changed_jobs, now)
         
-        for job in jobs:
-            try:
-                # Clean URL (remove query parameters for comparison)
-                clean_url = job['url'].split('?')[0] if '?' in job['url'] else job['url']
-                
-                # Check if job already exists (by URL or external_id)
-                cursor.execute('''
-                    SELECT id, first_seen_date, last_seen_date, is_active, company, title
-                    FROM jobs 
-                    WHERE url LIKE ? OR external_id = ?
-                ''', (f"{clean_url}%", job['external_id']))
-                
-                existing = cursor.fetchone()
-                
-                if existing:
-                    job_id, first_seen, last_seen, is_active, old_company, old_title = existing
-                    last_seen_date = datetime.fromisoformat(last_seen).date() if last_seen else None
-                    
-                    # Check if this is today's first sighting
-                    if last_seen_date != datetime.now().date():
-                        # Update last_seen_date
-                        cursor.execute('''
-                            UPDATE jobs 
-                            SET last_seen_date = ?,
-                                is_active = 1,
-                                updated_at = ?
-                            WHERE id = ?
-                        ''', (datetime.now().isoformat(), datetime.now().isoformat(), job_id))
-                        
-                        logger.info(f"📅 Updated job (still active): {job['title']}")
-                        updated_count += 1
-                    else:
-                        logger.debug(f"Already seen today: {job['title']}")
-                    
-                else:
-                    # Insert new job (标记为今日新增)
-                    cursor.execute('''
-                        INSERT INTO jobs (
-                            external_id, title, company, location, description, 
-                            url, category, job_type, salary_range, skills, 
-                            source, first_seen_date, last_seen_date, is_new_today
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        job['external_id'],
-                        job['title'],
-                        job['company'],
-                        job['location'],
-                        job.get('description', ''),  # Use description from job if available
-                        job['url'],
-                        self._classify_job(job['title']),
-                        job['job_type'],
-                        job['salary_range'],
-                        '',  # Skills will be empty for now
-                        job.get('source', 'seek'),  # Source from job data
-                        datetime.now().isoformat(),
-                        datetime.now().isoformat(),
-                        1  # is_new_today = 1 (今日新增)
-                    ))
-                    
-                    new_count += 1
-                    logger.info(f"✨ NEW job: {job['title']} at {job['company']}")
-                
-            except Exception as e:
-                logger.error(f"Failed to save job {job.get('title', 'Unknown')}: {e}")
-                continue
+        for job_id, _, changes in changed_jobs:
+            fields = [field for field in changes if field != 'description_hash']
+            if fields:
+                assignments = ', '.join(f"{field} = ?" for field in fields)
+                cursor.execute(
+                    f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ?",
+                    (*(changes[field][1] for field in fields), now, job_id)
+                )
+        
+        return len(changed_jobs)
+    
+    def _deactivate_unseen_jobs(self, cursor, sources, today, now):
+        """Mark active jobs from the scraped sources inactive if this run didn't see them.
+        
+        Jobs from sources that were not scraped (or failed) are left alone. The date
+        check compares the raw ISO timestamp against today's date so it stays sargable.
+        
+        Returns:
+            Number of jobs marked inactive, keyed by source
+        """
+        if not sources:
+            return {}
         
-        # Mark jobs as inactive if they weren't seen today
-        # (Only mark as inactive if they were active and last seen before today)
         cursor.execute('''
+            CREATE TEMP TABLE IF NOT EXISTS seen_job_ids (
+                external_id TEXT PRIMARY KEY
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('DELETE FROM seen_job_ids')
+        cursor.execute('''
+            INSERT OR IGNORE INTO seen_job_ids (external_id)
+            SELECT external_id FROM incoming_jobs
+        ''')
+        
+        placeholders = ', '.join('?' for _ in sources)
+        cursor.execute(f'''
             UPDATE jobs 
             SET is_active = 0, updated_at = ?
             WHERE is_active = 1 
-            AND date(last_seen_date) < date(?)
-        ''', (datetime.now().isoformat(), datetime.now().isoformat()))
+              AND source IN ({placeholders})
+              AND last_seen_date < ?
+              AND NOT EXISTS (SELECT 1 FROM seen_job_ids s WHERE s.external_id = jobs.external_id)
+            RETURNING source
+        ''', (now, *sources, today))
         
-        inactive_count = cursor.rowcount
+        inactive_by_source = {}
+        for (source,) in cursor.fetchall():
+            inactive_by_source[source] = inactive_by_source.get(source, 0) + 1
+        cursor.execute('DROP TABLE seen_job_ids')
+        return inactive_by_source
+    
+    def _load_incoming_jobs(self, cursor, jobs, seen_at):
+        """Bulk-load the scraped batch into the incoming_jobs temp table, one row per job."""
+        cursor.execute('''
+            CREATE TEMP TABLE IF NOT EXISTS incoming_jobs (
+                external_id TEXT,
+                title TEXT,
+                company TEXT,
+                location TEXT,
+                description TEXT,
+                url TEXT,
+                canonical_url TEXT,
+                category TEXT,
+                job_type TEXT,
+                salary_range TEXT,
+                source TEXT,
+                description_hash TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                description_unchanged INTEGER,
+                seen_at TEXT
+            )
+        ''')
+        cursor.execute('DELETE FROM incoming_jobs')
         
-        conn.commit()
-        conn.close()
+        cursor.executemany('''
+            INSERT INTO incoming_jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', self._incoming_rows(jobs, seen_at))
         
-        logger.info(f"📊 Summary: {new_count} new jobs, {updated_count} updated jobs, {inactive_count} marked inactive")
-        return new_count
+        # The same job can show up under several searches; keep its first sighting
+        cursor.execute('''
+            DELETE FROM incoming_jobs
+            WHERE rowid NOT IN (SELECT MIN(rowid) FROM incoming_jobs GROUP BY external_id)
+               OR rowid NOT IN (SELECT MIN(rowid) FROM incoming_jobs GROUP BY canonical_url)
+        ''')
+    
+    def _incoming_rows(self, jobs, seen_at):
+        """Scraped jobs as rows ordered like database.backends.INCOMING_COLUMNS, skipping jobs missing a required field."""
+        rows = []
+        for job in jobs:
+            missing = [field for field in REQUIRED_JOB_FIELDS if not job.get(field)]
+            if missing:
+                logger.warning(f"Skipping job without {'/'.join(missing)}: "
+                               f"{job.get('title') or job.get('url') or 'Unknown'}")
+                continue
+            rows.append((
+                job['external_id'],
+                job['title'],
+                job['company'],
+                job.get('location'),
+                job.get('description', ''),  # Use description from job if available
+                job['url'],
+                canonicalize_url(job['url'], job.get('source', 'seek')),
+                self._classify_job(job['title']),
+                job.get('job_type'),
+                job.get('salary_range'),
+                job.get('source', 'seek'),  # Source from job data
+                job.get('description_hash'),
+                job.get('etag'),
+                job.get('last_modified'),
+                1 if job.get('description_unchanged') else 0,
+                seen_at
+            ))
+        return rows
     
     def _classify_job(self, title):
         """Simple job classification based on title keywords."""
@@ -269,11 +618,12 @@ def main():
     
     parser = argparse.ArgumentParser(description='Scrape IT jobs from multiple sources')
     parser.add_argument('--sources', nargs='+', 
-                        choices=['seek', 'linkedin', 'indeed', 'trademe', 'all'],
+                        choices=available_sources() + ['all'],
                         default=['all'],
                         help='Job sources to scrape (default: all)')
     parser.add_argument('--db', default=None,
-                        help='Database path (default: auto-detect project root)')
+                        help='SQLite database path (default: job_scraper.db in the project root), '
+                             'or a postgresql:// URL to ingest into Postgres instead')
     parser.add_argument('--fetch-descriptions', action='store_true',
                         help='Fetch full job descriptions (slower but more detailed)')
     parser.add_argument('--max-descriptions', type=int, default=None,
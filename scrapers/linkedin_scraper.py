@@ -5,10 +5,18 @@ LinkedIn NZ IT Jobs Scraper
 import logging
 import time
 import random
-import re
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 
+try:
+    from .browser_daemon import attach_driver
+    from .url_canonical import stable_job_id
+    from .scrape_metrics import ScrapeMetrics
+except ImportError:
+    from browser_daemon import attach_driver
+    from url_canonical import stable_job_id
+    from scrape_metrics import ScrapeMetrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,6 +26,7 @@ class LinkedInScraper:
     def __init__(self):
         self.base_url = "https://www.linkedin.com"
         self.driver = None
+        self.metrics = ScrapeMetrics()
         
     def _setup_driver(self):
         """Setup Selenium driver with anti-detection measures."""
@@ -51,7 +60,8 @@ class LinkedInScraper:
             user_data_dir = os.path.join(tempfile.gettempdir(), f'selenium_linkedin_{os.getpid()}')
             chrome_options.add_argument(f'--user-data-dir={user_data_dir}')
             
-            self.driver = webdriver.Chrome(options=chrome_options)
+            # Prefer a pre-warmed browser from the Chrome daemon, fall back to a local one
+            self.driver = attach_driver(window_size=(1920, 1080)) or webdriver.Chrome(options=chrome_options)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             # Set timeouts
@@ -78,7 +88,10 @@ class LinkedInScraper:
         Args:
             max_pages: Maximum pages to scrape
         """
-        if not self._setup_driver():
+        self.metrics = ScrapeMetrics()
+        with self.metrics.phase('driver_startup'):
+            driver_ready = self._setup_driver()
+        if not driver_ready:
             return []
         
         try:
@@ -107,8 +120,10 @@ class LinkedInScraper:
                         page_url = f"{search_url}&start={page * 25}"
                         logger.info(f"Scraping LinkedIn page {page + 1}: {page_url}")
                         
-                        self.driver.get(page_url)
+                        with self.metrics.phase('listing_pages'):
+                            self.driver.get(page_url)
                         time.sleep(random.uniform(3, 5))  # LinkedIn is strict, wait longer
+                        self.metrics.pages += 1
                         
                         # Wait for job cards
                         try:
@@ -116,9 +131,10 @@ class LinkedInScraper:
                             from selenium.webdriver.support import expected_conditions as EC
                             from selenium.webdriver.common.by import By
                             
-                            WebDriverWait(self.driver, 10).until(
-                                EC.presence_of_element_located((By.CSS_SELECTOR, "div.base-card"))
-                            )
+                            with self.metrics.phase('listing_pages'):
+                                WebDriverWait(self.driver, 10).until(
+                                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.base-card"))
+                                )
                         except:
                             logger.warning(f"No job listings found on LinkedIn page {page + 1}")
                             consecutive_empty_pages += 1
@@ -128,8 +144,9 @@ class LinkedInScraper:
                             continue
                         
                         # Parse job listings
-                        page_source = self.driver.page_source
-                        page_jobs = self._parse_job_listings(page_source)
+                        with self.metrics.phase('parse'):
+                            page_source = self.driver.page_source
+                            page_jobs = self._parse_job_listings(page_source)
                         
                         if page_jobs:
                             jobs.extend(page_jobs)
@@ -240,11 +257,8 @@ class LinkedInScraper:
     
     def _extract_job_id(self, url: str) -> str:
         """Extract job ID from LinkedIn URL."""
-        # LinkedIn URLs typically: /jobs/view/1234567890
-        match = re.search(r'/view/(\d+)', url)
-        if match:
-            return f"linkedin_{match.group(1)}"
-        return f"linkedin_{hash(url)}"
+        # LinkedIn URLs typically: /jobs/view/1234567890 or /jobs/view/<slug>-1234567890
+        return stable_job_id(url, 'linkedin')
 
 
 if __name__ == "__main__":
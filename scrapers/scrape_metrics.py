@@ -0,0 +1,38 @@
+"""
+Per-phase timing for a single source scrape.
+
+Scrapers wrap their work in `with self.metrics.phase('listing_pages'):` blocks; the
+integrated scraper adds the DB write and stores the totals in `scrape_logs`.
+"""
+
+import time
+from contextlib import contextmanager
+
+# Phases recorded for every source, in pipeline order
+PHASES = ('driver_startup', 'listing_pages', 'detail_fetches', 'parse', 'db_write')
+
+
+class ScrapeMetrics:
+    """Accumulated seconds per phase plus the number of listing pages loaded."""
+
+    def __init__(self):
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        self.pages = 0
+
+    @contextmanager
+    def phase(self, name):
+        """Add the wall time of the block to a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] += time.perf_counter() - start
+
+    def pages_per_second(self):
+        """Listing pages per second of page-load plus parse time (None before any page)."""
+        seconds = self.durations['listing_pages'] + self.durations['parse']
+        return round(self.pages / seconds, 3) if self.pages and seconds else None
+
+    def __repr__(self):
+        timings = ', '.join(f"{name}={seconds:.1f}s" for name, seconds in self.durations.items())
+        return f"<ScrapeMetrics(pages={self.pages}, {timings})>"
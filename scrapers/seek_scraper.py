@@ -5,18 +5,33 @@ Lightweight Selenium scraper for Seek NZ optimized for cheap AWS instances.
 import time
 import random
 import re
+import hashlib
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
+
+try:
+    from .browser_daemon import attach_driver
+    from .scrape_metrics import ScrapeMetrics
+except ImportError:
+    from browser_daemon import attach_driver
+    from scrape_metrics import ScrapeMetrics
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Pause between detail page fetches (seconds). Revalidating a page that hasn't
+# changed (304, or the same content hash) costs the site little, so it waits less.
+DETAIL_DELAY = (2, 4)
+REVALIDATION_DELAY = (0.2, 0.5)
+
 class SeekScraper:
     """Lightweight Selenium scraper for Seek NZ."""
     
     def __init__(self):
         self.base_url = 'https://www.seek.co.nz'
         self.driver = None
+        self.metrics = ScrapeMetrics()
+        self.session = None
     
     def _setup_driver(self):
         """Setup lightweight Selenium WebDriver."""
@@ -85,7 +100,8 @@ class SeekScraper:
             user_data_dir = os.path.join(tempfile.gettempdir(), f'selenium_chrome_{os.getpid()}')
             chrome_options.add_argument(f'--user-data-dir={user_data_dir}')
             
-            self.driver = webdriver.Chrome(options=chrome_options)
+            # Prefer a pre-warmed browser from the Chrome daemon, fall back to a local one
+            self.driver = attach_driver(window_size=(800, 600)) or webdriver.Chrome(options=chrome_options)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             # Set timeouts
@@ -108,7 +124,10 @@ class SeekScraper:
             max_pages: Maximum pages to scrape (default 999 means scrape until no more pages)
             keep_driver: If True, keep the driver open for fetching job descriptions
         """
-        if not self._setup_driver():
+        self.metrics = ScrapeMetrics()
+        with self.metrics.phase('driver_startup'):
+            driver_ready = self._setup_driver()
+        if not driver_ready:
             return []
         
         try:
@@ -132,8 +151,10 @@ class SeekScraper:
                         page_url = f"{search_url}&page={page}"
                         logger.info(f"Scraping page {page}: {page_url}")
                         
-                        self.driver.get(page_url)
+                        with self.metrics.phase('listing_pages'):
+                            self.driver.get(page_url)
                         time.sleep(random.uniform(2, 4))  # Random delay to avoid detection
+                        self.metrics.pages += 1
                         
                         # Quick check for job listings
                         try:
@@ -141,9 +162,10 @@ class SeekScraper:
                             from selenium.webdriver.support import expected_conditions as EC
                             from selenium.webdriver.common.by import By
                             
-                            WebDriverWait(self.driver, 5).until(
-                                EC.presence_of_element_located((By.CSS_SELECTOR, "article[data-automation='normalJob']"))
-                            )
+                            with self.metrics.phase('listing_pages'):
+                                WebDriverWait(self.driver, 5).until(
+                                    EC.presence_of_element_located((By.CSS_SELECTOR, "article[data-automation='normalJob']"))
+                                )
                         except:
                             logger.warning(f"No job listings found on page {page}, stopping pagination...")
                             consecutive_empty_pages += 1
@@ -152,8 +174,9 @@ class SeekScraper:
                             continue
                         
                         # Parse job listings
-                        page_source = self.driver.page_source
-                        page_jobs = self._parse_job_listings(page_source)
+                        with self.metrics.phase('parse'):
+                            page_source = self.driver.page_source
+                            page_jobs = self._parse_job_listings(page_source)
                         
                         if page_jobs:
                             jobs.extend(page_jobs)
@@ -367,29 +390,9 @@ class SeekScraper:
                 logger.warning("Could not find job description element")
                 return ""
             
-            # Parse the page
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Try multiple selectors for job description
-            description_selectors = [
-                'div[data-automation="jobAdDetails"]',
-                'div.job-description',
-                'div[class*="jobdetails"]',
-                'div[class*="job-detail"]',
-                'article',
-            ]
-            
-            description = ""
-            for selector in description_selectors:
-                desc_elem = soup.select_one(selector)
-                if desc_elem:
-                    # Extract text and clean it
-                    description = desc_elem.get_text(separator='\n', strip=True)
-                    break
+            description = self._parse_description(self.driver.page_source)
             
             if description:
-                # Clean up the description
-                description = '\n'.join(line.strip() for line in description.split('\n') if line.strip())
                 logger.info(f"Successfully fetched description ({len(description)} chars)")
                 return description
             else:
@@ -400,50 +403,182 @@ class SeekScraper:
             logger.error(f"Failed to fetch job description: {e}")
             return ""
     
-    def enrich_jobs_with_descriptions(self, jobs: List[Dict], max_jobs: int = 50) -> List[Dict]:
+    def _parse_description(self, html: str) -> str:
+        """Extract and clean the description text from a job detail page."""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Try multiple selectors for job description
+        description_selectors = [
+            'div[data-automation="jobAdDetails"]',
+            'div.job-description',
+            'div[class*="jobdetails"]',
+            'div[class*="job-detail"]',
+            'article',
+        ]
+        
+        description = ""
+        for selector in description_selectors:
+            desc_elem = soup.select_one(selector)
+            if desc_elem:
+                # Extract text and clean it
+                description = desc_elem.get_text(separator='\n', strip=True)
+                break
+        
+        # Clean up the description
+        return '\n'.join(line.strip() for line in description.split('\n') if line.strip())
+    
+    @staticmethod
+    def content_hash(description: str) -> str:
+        """Stable hash of a description, used to detect unchanged detail pages."""
+        return hashlib.sha256(description.encode('utf-8')).hexdigest()
+    
+    def _get_session(self):
+        """Lazily create the HTTP session used for conditional detail requests."""
+        if self.session is None:
+            import requests
+            self.session = requests.Session()
+            self.session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'Accept-Language': 'en-NZ,en;q=0.9',
+            })
+        return self.session
+    
+    def fetch_job_description_if_changed(self, job_url: str, etag: Optional[str] = None,
+                                         last_modified: Optional[str] = None,
+                                         content_hash: Optional[str] = None) -> Dict:
+        """
+        Re-validate a job detail page, skipping work when nothing has changed.
+        
+        Uses a conditional HTTP GET first (If-None-Match / If-Modified-Since), so an
+        unchanged page costs a 304 and no parsing. Falls back to the Selenium driver
+        when the static HTML has no description and a driver is available.
+        
+        Args:
+            job_url: Full URL to the job posting
+            etag: ETag stored from the previous fetch
+            last_modified: Last-Modified stored from the previous fetch
+            content_hash: Description hash stored from the previous fetch
+            
+        Returns:
+            Dict with 'status' ('not_modified', 'unchanged', 'changed' or 'failed'),
+            'description', 'description_hash', 'etag' and 'last_modified'
+        """
+        result = {
+            'status': 'failed',
+            'description': '',
+            'description_hash': content_hash,
+            'etag': etag,
+            'last_modified': last_modified,
+        }
+        
+        description = ""
+        try:
+            headers = {}
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+            
+            response = self._get_session().get(job_url, headers=headers, timeout=15)
+            
+            if response.status_code == 304:
+                logger.debug(f"Not modified: {job_url[:60]}")
+                result['status'] = 'not_modified'
+                return result
+            
+            if response.status_code == 200:
+                result['etag'] = response.headers.get('ETag')
+                result['last_modified'] = response.headers.get('Last-Modified')
+                description = self._parse_description(response.text)
+            else:
+                logger.warning(f"HTTP {response.status_code} for {job_url[:60]}")
+                
+        except Exception as e:
+            logger.warning(f"HTTP fetch failed for {job_url[:60]}: {e}")
+        
+        # Seek sometimes renders the description client-side only
+        if not description and self.driver:
+            description = self.fetch_job_description(job_url)
+        
+        if not description:
+            return result
+        
+        new_hash = self.content_hash(description)
+        result['status'] = 'unchanged' if new_hash == content_hash else 'changed'
+        result['description'] = description
+        result['description_hash'] = new_hash
+        return result
+    
+    def enrich_jobs_with_descriptions(self, jobs: List[Dict], max_jobs: int = 50,
+                                      validators: Optional[Dict[str, Dict]] = None) -> List[Dict]:
         """
         Enrich job listings with full descriptions.
-        Note: This method assumes the driver is still active from scrape_jobs(keep_driver=True).
+        Detail pages are fetched over HTTP with conditional requests; the driver from
+        scrape_jobs(keep_driver=True) is used as a fallback when it is still open.
         
         Args:
             jobs: List of job dictionaries
-            max_jobs: Maximum number of jobs to fetch descriptions for (to avoid long runtime)
+            max_jobs: Maximum number of jobs to fetch descriptions for (None = all)
+            validators: Stored description_hash/etag/last_modified keyed by external_id
             
         Returns:
-            Updated list of jobs with descriptions
+            Updated list of jobs with descriptions. Jobs whose page has not changed are
+            flagged with 'description_unchanged' and keep no description field.
         """
-        if not self.driver:
-            logger.warning("Driver not initialized, cannot fetch descriptions")
-            return jobs
+        validators = validators or {}
+        limit = len(jobs) if max_jobs is None else min(len(jobs), max_jobs)
         
-        logger.info(f"Enriching {min(len(jobs), max_jobs)} jobs with full descriptions...")
+        logger.info(f"Enriching {limit} jobs with full descriptions...")
         
         enriched_count = 0
-        for i, job in enumerate(jobs[:max_jobs]):
+        unchanged_count = 0
+        for i, job in enumerate(jobs[:limit]):
             try:
-                description = self.fetch_job_description(job['url'])
-                job['description'] = description
+                stored = validators.get(job.get('external_id'), {})
+                with self.metrics.phase('detail_fetches'):
+                    result = self.fetch_job_description_if_changed(
+                        job['url'],
+                        etag=stored.get('etag'),
+                        last_modified=stored.get('last_modified'),
+                        content_hash=stored.get('description_hash')
+                    )
                 
-                if description:
+                unchanged = result['status'] in ('not_modified', 'unchanged')
+                if unchanged:
+                    job['description_unchanged'] = True
+                    job['etag'] = result['etag']
+                    job['last_modified'] = result['last_modified']
+                    unchanged_count += 1
+                elif result['status'] == 'changed':
+                    job['description'] = result['description']
+                    job['description_hash'] = result['description_hash']
+                    job['etag'] = result['etag']
+                    job['last_modified'] = result['last_modified']
                     enriched_count += 1
+                else:
+                    job['description'] = ""
                 
                 # Add a delay to avoid overwhelming the server
-                if i < len(jobs) - 1:  # Don't delay after last job
-                    time.sleep(random.uniform(2, 4))
+                if i < limit - 1:  # Don't delay after last job
+                    time.sleep(random.uniform(*(REVALIDATION_DELAY if unchanged else DETAIL_DELAY)))
                     
             except Exception as e:
                 logger.error(f"Failed to enrich job {job.get('title', 'Unknown')}: {e}")
                 job['description'] = ""
                 continue
         
-        logger.info(f"Successfully enriched {enriched_count}/{min(len(jobs), max_jobs)} jobs with descriptions")
+        logger.info(f"Successfully enriched {enriched_count}/{limit} jobs with descriptions ({unchanged_count} unchanged)")
         return jobs
     
     def close_driver(self):
-        """Close the Selenium driver if it's open."""
+        """Close the Selenium driver and HTTP session if they're open."""
         if self.driver:
             try:
                 self.driver.quit()
                 logger.info("Driver closed successfully")
             except Exception as e:
                 logger.error(f"Error closing driver: {e}")
+            self.driver = None
+        if self.session:
+            self.session.close()
+            self.session = None
@@ -0,0 +1,75 @@
+"""
+Registry of job sources known to the integrated scraper.
+
+Each source declares its scraper class as an entry point ("module:Class") plus its
+default page limit and capabilities. Scraper modules are only imported when a source
+is actually selected, so `--sources seek` never loads the other scrapers.
+"""
+
+import importlib
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class SourcePlugin:
+    """Declaration of a single job source."""
+
+    def __init__(self, name: str, entry_point: str, max_pages: int,
+                 descriptions: bool = False, http_mode: bool = False):
+        """
+        Args:
+            name: Source name used on the command line and in the `source` column
+            entry_point: "module:Class" of the scraper, relative to the scrapers package
+            max_pages: Default page limit passed to scrape_jobs()
+            descriptions: Scraper supports enrich_jobs_with_descriptions() and
+                scrape_jobs(keep_driver=...)
+            http_mode: Detail pages can be re-validated over plain HTTP
+                (conditional GETs) instead of the Selenium driver
+        """
+        self.name = name
+        self.entry_point = entry_point
+        self.max_pages = max_pages
+        self.descriptions = descriptions
+        self.http_mode = http_mode
+
+    def load(self):
+        """Import the scraper module and return the scraper class."""
+        module_name, _, class_name = self.entry_point.partition(':')
+        if __package__:
+            module = importlib.import_module(f"{__package__}.{module_name}")
+        else:
+            module = importlib.import_module(module_name)
+        return getattr(module, class_name)
+
+    def create(self):
+        """Instantiate the scraper for this source."""
+        return self.load()()
+
+    def __repr__(self):
+        return f"<SourcePlugin(name='{self.name}', entry_point='{self.entry_point}')>"
+
+
+# Adding a source only needs an entry here
+SOURCES: Dict[str, SourcePlugin] = {
+    plugin.name: plugin for plugin in [
+        SourcePlugin('seek', 'seek_scraper:SeekScraper', max_pages=999,
+                     descriptions=True, http_mode=True),
+        SourcePlugin('linkedin', 'linkedin_scraper:LinkedInScraper', max_pages=5),  # LinkedIn is slower
+        SourcePlugin('indeed', 'indeed_scraper:IndeedScraper', max_pages=10),
+        SourcePlugin('trademe', 'trademe_scraper:TradeMeScraper', max_pages=10),
+    ]
+}
+
+
+def available_sources() -> List[str]:
+    """Names of all registered sources, in registration order."""
+    return list(SOURCES.keys())
+
+
+def get_plugin(name: str) -> SourcePlugin:
+    """Look up a registered source, raising KeyError for unknown names."""
+    if name not in SOURCES:
+        raise KeyError(f"Unknown job source: {name}")
+    return SOURCES[name]
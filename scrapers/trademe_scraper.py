@@ -6,10 +6,18 @@ TradeMe is a major New Zealand job board
 import logging
 import time
 import random
-import re
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 
+try:
+    from .browser_daemon import attach_driver
+    from .url_canonical import stable_job_id
+    from .scrape_metrics import ScrapeMetrics
+except ImportError:
+    from browser_daemon import attach_driver
+    from url_canonical import stable_job_id
+    from scrape_metrics import ScrapeMetrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,6 +27,7 @@ class TradeMeScraper:
     def __init__(self):
         self.base_url = "https://www.trademe.co.nz"
         self.driver = None
+        self.metrics = ScrapeMetrics()
         
     def _setup_driver(self):
         """Setup Selenium driver with anti-detection measures."""
@@ -41,7 +50,8 @@ class TradeMeScraper:
             user_data_dir = os.path.join(tempfile.gettempdir(), f'selenium_trademe_{os.getpid()}')
             chrome_options.add_argument(f'--user-data-dir={user_data_dir}')
             
-            self.driver = webdriver.Chrome(options=chrome_options)
+            # Prefer a pre-warmed browser from the Chrome daemon, fall back to a local one
+            self.driver = attach_driver(window_size=(1920, 1080)) or webdriver.Chrome(options=chrome_options)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             self.driver.set_page_load_timeout(30)
             self.driver.implicitly_wait(5)
@@ -58,7 +68,10 @@ class TradeMeScraper:
     
     def scrape_jobs(self, max_pages: int = 15) -> List[Dict]:
         """Scrape IT jobs from TradeMe Jobs NZ."""
-        if not self._setup_driver():
+        self.metrics = ScrapeMetrics()
+        with self.metrics.phase('driver_startup'):
+            driver_ready = self._setup_driver()
+        if not driver_ready:
             return []
         
         try:
@@ -82,8 +95,10 @@ class TradeMeScraper:
                         page_url = f"{search_url}?page={page}"
                         logger.info(f"Scraping TradeMe page {page}: {page_url}")
                         
-                        self.driver.get(page_url)
+                        with self.metrics.phase('listing_pages'):
+                            self.driver.get(page_url)
                         time.sleep(random.uniform(2, 4))
+                        self.metrics.pages += 1
                         
                         # Wait for job cards
                         try:
@@ -91,9 +106,10 @@ class TradeMeScraper:
                             from selenium.webdriver.support import expected_conditions as EC
                             from selenium.webdriver.common.by import By
                             
-                            WebDriverWait(self.driver, 10).until(
-                                EC.presence_of_element_located((By.CSS_SELECTOR, "tm-search-card-browse, div.tm-search-results"))
-                            )
+                            with self.metrics.phase('listing_pages'):
+                                WebDriverWait(self.driver, 10).until(
+                                    EC.presence_of_element_located((By.CSS_SELECTOR, "tm-search-card-browse, div.tm-search-results"))
+                                )
                         except:
                             logger.warning(f"No job listings found on TradeMe page {page}")
                             consecutive_empty_pages += 1
@@ -102,8 +118,9 @@ class TradeMeScraper:
                             page += 1
                             continue
                         
-                        page_source = self.driver.page_source
-                        page_jobs = self._parse_job_listings(page_source)
+                        with self.metrics.phase('parse'):
+                            page_source = self.driver.page_source
+                            page_jobs = self._parse_job_listings(page_source)
                         
                         if page_jobs:
                             jobs.extend(page_jobs)
@@ -211,10 +228,7 @@ class TradeMeScraper:
     def _extract_job_id(self, url: str) -> str:
         """Extract job ID from TradeMe URL."""
         # TradeMe URLs typically: /a/jobs/.../listing/1234567
-        match = re.search(r'/listing/(\d+)', url)
-        if match:
-            return f"trademe_{match.group(1)}"
-        return f"trademe_{hash(url)}"
+        return stable_job_id(url, 'trademe')
 
 
 if __name__ == "__main__":
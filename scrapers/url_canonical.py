@@ -0,0 +1,89 @@
+"""
+URL canonicalization for job postings.
+
+Job boards decorate the same posting with tracking query strings, regional hosts and
+SEO slugs. Each source gets a rule that reduces a URL to one canonical form, which is
+stored in `jobs.canonical_url` for exact-match dedup and used to derive external ids
+that are stable across processes (unlike the built-in hash()).
+"""
+
+import re
+import hashlib
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# id_pattern is searched in the raw URL; canonical is the template for the canonical
+# URL; id_prefix is prepended to the native id to form external_id
+SOURCE_RULES = {
+    'seek': {
+        'id_pattern': re.compile(r'/job/(\d+)'),
+        'canonical': 'https://www.seek.co.nz/job/{id}',
+        'id_prefix': '',
+    },
+    'linkedin': {
+        # /jobs/view/1234567890 or /jobs/view/software-engineer-at-acme-1234567890
+        'id_pattern': re.compile(r'/jobs/view/(?:[^/?#]*-)?(\d+)'),
+        'canonical': 'https://www.linkedin.com/jobs/view/{id}',
+        'id_prefix': 'linkedin_',
+    },
+    'indeed': {
+        'id_pattern': re.compile(r'[?&]jk=([0-9A-Za-z]+)'),
+        'canonical': 'https://nz.indeed.com/viewjob?jk={id}',
+        'id_prefix': 'indeed_',
+    },
+    'trademe': {
+        'id_pattern': re.compile(r'/listing/(\d+)'),
+        'canonical': 'https://www.trademe.co.nz/a/jobs/listing/{id}',
+        'id_prefix': 'trademe_',
+    },
+}
+
+
+def _generic_canonical(url: str) -> str:
+    """Lower-case scheme and host, drop query string, fragment and trailing slash."""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, '', ''))
+
+
+def source_job_id(url: str, source: str) -> Optional[str]:
+    """Native job id embedded in the URL, or None if the source rule doesn't match."""
+    rule = SOURCE_RULES.get(source)
+    if not rule or not url:
+        return None
+    match = rule['id_pattern'].search(url)
+    return match.group(1) if match else None
+
+
+def canonicalize_url(url: str, source: Optional[str] = None) -> Optional[str]:
+    """
+    Reduce a job URL to its canonical form.
+
+    Args:
+        url: URL as scraped
+        source: Source name ('seek', 'linkedin', ...); unknown sources use generic rules
+
+    Returns:
+        Canonical URL, or None for an empty URL
+    """
+    if not url:
+        return None
+    job_id = source_job_id(url, source)
+    if job_id:
+        return SOURCE_RULES[source]['canonical'].format(id=job_id)
+    return _generic_canonical(url)
+
+
+def stable_job_id(url: str, source: str) -> str:
+    """
+    External id derived from the canonical URL.
+
+    Uses the native id when the URL carries one, otherwise a SHA-1 of the canonical
+    URL, so the same posting maps to the same id in every process.
+    """
+    prefix = SOURCE_RULES.get(source, {}).get('id_prefix', f'{source}_')
+    job_id = source_job_id(url, source)
+    if job_id:
+        return f"{prefix}{job_id}"
+    digest = hashlib.sha1((canonicalize_url(url, source) or '').encode('utf-8')).hexdigest()[:16]
+    return f"{prefix}{digest}"
@@ -1,55 +1,38 @@
 #!/usr/bin/env python3
 """
-修复数据库表结构 - 添加缺失的列
-用于解决 "no such column: is_new_today" 错误
+修复数据库表结构 - 运行 database/migrations.py 中尚未应用的迁移
+用于解决 "no such column: is_new_today" 等错误
 """
 
-import sqlite3
+import os
 import sys
 
+# 从 scripts/maintenance 运行时也能导入项目模块
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from database.sqlite import connect
+from database.migrations import migrate, get_version, MIGRATIONS
+
 def fix_database(db_path='job_scraper.db'):
-    """添加缺失的数据库列"""
+    """应用缺失的数据库迁移"""
     
     print("🔧 开始修复数据库表结构...")
     print(f"📁 数据库文件: {db_path}\n")
     
     try:
-        conn = sqlite3.connect(db_path)
+        conn = connect(db_path)
         cursor = conn.cursor()
         
-        # 检查现有列
-        cursor.execute("PRAGMA table_info(jobs)")
-        columns = [col[1] for col in cursor.fetchall()]
-        print(f"当前列 ({len(columns)}个):")
-        for col in columns:
-            print(f"  - {col}")
-        print()
-        
-        # 需要添加的列
-        required_columns = {
-            'source': ('TEXT', '"seek"'),
-            'is_new_today': ('BOOLEAN', '0'),
-            'is_active': ('BOOLEAN', '1'),
-            'first_seen_date': ('TIMESTAMP', 'CURRENT_TIMESTAMP'),
-            'last_seen_date': ('TIMESTAMP', 'CURRENT_TIMESTAMP'),
-        }
-        
-        added = []
-        skipped = []
-        
-        for col_name, (col_type, default_value) in required_columns.items():
-            if col_name not in columns:
-                try:
-                    sql = f'ALTER TABLE jobs ADD COLUMN {col_name} {col_type} DEFAULT {default_value}'
-                    cursor.execute(sql)
-                    added.append(col_name)
-                    print(f"✅ 添加列: {col_name} ({col_type})")
-                except Exception as e:
-                    print(f"❌ 添加列 {col_name} 失败: {e}")
-            else:
-                skipped.append(col_name)
+        version = get_version(conn)
+        print(f"当前 schema 版本: {version}\n")
         
-        conn.commit()
+        # 逐个应用缺失的迁移
+        applied = migrate(conn)
+        descriptions = {v: d for v, d, _ in MIGRATIONS}
+        for v in applied:
+            print(f"✅ 应用迁移 {v}: {descriptions[v]}")
         
         # 验证修复后的结构
         print("\n验证修复结果:")
@@ -68,8 +51,11 @@ def fix_database(db_path='job_scraper.db'):
             active_count = cursor.fetchone()[0]
             print(f"   - 活跃职位: {active_count}")
         
-        if 'is_new_today' in columns_after:
-            cursor.execute('SELECT COUNT(*) FROM jobs WHERE is_new_today = 1')
+        if 'first_seen_run_id' in columns_after:
+            cursor.execute('''
+                SELECT COUNT(*) FROM jobs
+                WHERE first_seen_run_id = (SELECT MAX(id) FROM ingest_runs WHERE finished_at IS NOT NULL)
+            ''')
             new_count = cursor.fetchone()[0]
             print(f"   - 今日新增: {new_count}")
         
@@ -84,12 +70,10 @@ def fix_database(db_path='job_scraper.db'):
         
         # 总结
         print("\n" + "=" * 60)
-        if added:
-            print(f"🎉 成功添加 {len(added)} 个列: {', '.join(added)}")
-        if skipped:
-            print(f"ℹ️  跳过已存在的 {len(skipped)} 个列")
-        if not added and not skipped:
-            print("✅ 所有必需列都已存在")
+        if applied:
+            print(f"🎉 成功应用 {len(applied)} 个迁移, schema 版本 {applied[-1]}")
+        else:
+            print("✅ 数据库已是最新版本")
         print("=" * 60)
         
         print("\n📝 下一步:")
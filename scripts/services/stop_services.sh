@@ -11,6 +11,10 @@ echo "🛑 Stopping all services..."
 pkill -f simple_app.py || echo "  simple_app.py not running"
 pkill -f scheduler_daemon.py || echo "  scheduler_daemon.py not running"
 
+# 停止常驻Chrome守护进程
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+python3 "$SCRIPT_DIR/../../scrapers/browser_daemon.py" stop || true
+
 # 等待进程完全停止
 sleep 2
 
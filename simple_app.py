@@ -3,16 +3,45 @@
 Simplified Flask app without SQLAlchemy dependencies for testing.
 """
 
-from flask import Flask, render_template, request, jsonify
-import sqlite3
+from flask import Flask, Response, render_template, request, jsonify
 import json
+import base64
 import logging
 from datetime import datetime
 from ai_assistant import JobMarketAI
+from database.sqlite import get_connection
+from database.migrations import migrate
+from database.snapshot import get_read_connection, open_snapshot, publish_snapshot
+from database.search import SNIPPET_SQL, build_match_query, search_terms
+from database.counts import JobCounts
+from database.generation import current_generation, generation_modified_at
+from response_cache import create_response_cache, conditional
+from api_serialization import OrjsonProvider, compress_response, stream_json
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'dev-secret-key'
 
+# orjson encoding and gzip/Brotli compression of responses (api_serialization.py)
+app.json = OrjsonProvider(app)
+app.after_request(compress_response)
+
+# Pages with more jobs than this are encoded and sent in chunks
+STREAM_MIN_JOBS = 200
+
+# Fields of a job in /api/jobs, and the columns they are selected from, in the same
+# order (the ? is the latest run id). The preview is stored truncated at ingest, so
+# no description body is read.
+JOB_LIST_FIELDS = (
+    'id', 'title', 'company', 'location', 'salary_range', 'job_type', 'category',
+    'skills', 'url', 'source', 'is_new_today', 'created_at', 'description',
+)
+JOB_LIST_COLUMNS = '''
+    jobs.id, jobs.title, jobs.company, jobs.location, jobs.salary_range, jobs.job_type,
+    jobs.category, jobs.skills, jobs.url, jobs.source,
+    COALESCE(jobs.first_seen_run_id = ?, 0) AS is_new_today,
+    jobs.created_at, jobs.description_preview
+'''
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -23,69 +52,54 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')  # 从环境变量读取
 ai_assistant = JobMarketAI(db_path='job_scraper.db', openai_api_key=OPENAI_API_KEY)
 logger.info(f"AI Assistant enabled: {ai_assistant.enabled}")
 
+# Whole responses of dashboard endpoints, cached per data generation (response_cache.py)
+response_cache = create_response_cache()
+
+def data_generation():
+    """Bumped whenever the read snapshot is published (ingest, enrichment, description fetches)."""
+    return current_generation('job_scraper.db')
+
+def data_modified_at():
+    """When the served data last changed (Last-Modified of API responses)."""
+    return generation_modified_at('job_scraper.db')
+
+# Listing totals, cached until the data generation moves on (database/counts.py)
+job_counts = JobCounts(data_generation)
+
 def get_db_connection():
-    """Get database connection."""
-    conn = sqlite3.connect('job_scraper.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's read connection (the published read-only snapshot when current)."""
+    return get_read_connection('job_scraper.db')
+
+def get_latest_run_id(conn):
+    """Id of the most recent finished ingest run; jobs first seen in it count as new."""
+    row = conn.execute(
+        "SELECT MAX(id) FROM ingest_runs WHERE finished_at IS NOT NULL"
+    ).fetchone()
+    return row[0] if row else None
+
+def encode_cursor(values):
+    """Opaque pagination cursor holding the sort key of a page's last row."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+def decode_cursor(token, size):
+    """Sort key values from encode_cursor(); raises ValueError if the cursor is malformed."""
+    values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    if (not isinstance(values, list) or len(values) != size
+            or not all(isinstance(value, (int, float)) for value in values)):
+        raise ValueError(f"bad cursor: {token}")
+    return values
 
 def init_database():
-    """Initialize database tables."""
-    conn = get_db_connection()
-    
-    # Create jobs table
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS jobs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            external_id TEXT UNIQUE,
-            title TEXT NOT NULL,
-            company TEXT NOT NULL,
-            location TEXT,
-            salary_range TEXT,
-            job_type TEXT,
-            description TEXT,
-            url TEXT,
-            category TEXT,
-            skills TEXT,
-            first_seen_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_seen_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            is_active BOOLEAN DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Create job_snapshots table
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS job_snapshots (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            job_id INTEGER,
-            snapshot_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            field_changes TEXT,
-            snapshot_data TEXT,
-            FOREIGN KEY (job_id) REFERENCES jobs (id)
-        )
-    ''')
+    """Create or upgrade the database schema (see database/migrations.py)."""
+    applied = migrate(get_connection('job_scraper.db'))
+    logger.info(f"Database initialized successfully (migrations applied: {applied or 'none'})")
     
-    # Create scrape_logs table
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS scrape_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            source TEXT NOT NULL,
-            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            jobs_found INTEGER DEFAULT 0,
-            jobs_new INTEGER DEFAULT 0,
-            jobs_updated INTEGER DEFAULT 0,
-            jobs_removed INTEGER DEFAULT 0,
-            status TEXT DEFAULT 'success',
-            error_message TEXT,
-            duration_seconds REAL
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
-    logger.info("Database initialized successfully")
+    # Serve from a snapshot right away instead of waiting for the next ingest
+    snapshot = open_snapshot('job_scraper.db')
+    if snapshot is None:
+        publish_snapshot('job_scraper.db')
+    else:
+        snapshot.close()
 
 @app.route('/')
 def index():
@@ -93,6 +107,7 @@ def index():
     return render_template('index.html')
 
 @app.route('/api/jobs')
+@conditional(data_generation, data_modified_at)
 def get_jobs():
     """Get jobs with filtering and pagination."""
     try:
@@ -103,6 +118,7 @@ def get_jobs():
         location = request.args.get('location', '')
         search = request.args.get('search', '')
         source = request.args.get('source', '')  # Add source filter
+        tech = request.args.get('tech', '')
         
         conn = get_db_connection()
         
@@ -122,75 +138,117 @@ def get_jobs():
             where_conditions.append("source = ?")
             params.append(source)
         
-        if search:
-            where_conditions.append("(title LIKE ? OR company LIKE ? OR description LIKE ?)")
-            search_param = f'%{search}%'
-            params.extend([search_param, search_param, search_param])
+        # Jobs whose enriched tech stack includes a technology (database/job_tech.py)
+        if tech:
+            where_conditions.append("jobs.id IN (SELECT job_id FROM job_tech WHERE tech = ?)")
+            params.append(tech)
+        
+        # Full-text search through the FTS5 index (database/search.py)
+        match = build_match_query(search) if search else None
         
         where_clause = " AND ".join(where_conditions)
         
-        # Get total count
-        count_query = f"SELECT COUNT(*) FROM jobs WHERE {where_clause}"
-        total = conn.execute(count_query, params).fetchone()[0]
-        
-        # Get jobs with pagination (新工作排在前面)
-        offset = (page - 1) * per_page
-        jobs_query = f"""
-            SELECT * FROM jobs 
-            WHERE {where_clause}
-            ORDER BY is_new_today DESC, created_at DESC 
-            LIMIT ? OFFSET ?
-        """
-        params.extend([per_page, offset])
+        # Total: cached exact count, an estimate for free-text searches, or none at all
+        count_mode = request.args.get('count', 'estimate' if match else 'exact')
+        if count_mode not in ('exact', 'estimate', 'none'):
+            return jsonify({'error': "count must be 'exact', 'estimate' or 'none'"}), 400
+        if count_mode == 'none':
+            total = None
+        elif match and count_mode == 'estimate':
+            total = job_counts.estimate(conn, where_clause, params, search_terms(search))
+        else:
+            total = job_counts.exact(conn, where_clause, params, match)
+        
+        # Keyset pagination: a cursor resumes right after the last row of the previous
+        # page, so every page costs the same. page/OFFSET still works without one.
+        after = request.args.get('cursor')
+        if after:
+            try:
+                after = decode_cursor(after, 2 if match else 1)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+        offset = 0 if after else (page - 1) * per_page
+        latest_run_id = get_latest_run_id(conn)
+        
+        if match:
+            # Best BM25 matches first, with a highlighted snippet of the matched text
+            keyset = "AND (rank > ? OR (rank = ? AND jobs.id > ?))" if after else ""
+            jobs_query = f"""
+                SELECT {JOB_LIST_COLUMNS}, {SNIPPET_SQL} AS snippet, rank AS search_rank
+                FROM jobs_fts
+                JOIN jobs ON jobs.id = jobs_fts.rowid
+                WHERE jobs_fts MATCH ? AND {where_clause} {keyset}
+                ORDER BY rank, jobs.id
+                LIMIT ? OFFSET ?
+            """
+            params = [latest_run_id, match, *params]
+            if after:
+                params.extend([after[0], after[0], after[1]])
+        else:
+            # 新工作排在前面: ids are AUTOINCREMENT, so id order is insertion order
+            # and puts the latest run's jobs first, the same as sorting by
+            # first_seen_run_id, created_at. The is_active indexes end in the rowid,
+            # so every filter combination seeks straight to the cursor.
+            keyset = "AND id < ?" if after else ""
+            jobs_query = f"""
+                SELECT {JOB_LIST_COLUMNS} FROM jobs 
+                WHERE {where_clause} {keyset}
+                ORDER BY id DESC 
+                LIMIT ? OFFSET ?
+            """
+            params = [latest_run_id, *params]
+            if after:
+                params.append(after[0])
+        # One extra row tells whether there is a next page
+        params.extend([per_page + 1, offset])
         
         jobs = conn.execute(jobs_query, params).fetchall()
+        has_more = len(jobs) > per_page
+        jobs = jobs[:per_page]
         
-        # Convert to list of dictionaries
-        job_list = []
-        for job in jobs:
-            job_dict = {
-                'id': job['id'],
-                'title': job['title'],
-                'company': job['company'],
-                'location': job['location'],
-                'salary_range': job['salary_range'],
-                'job_type': job['job_type'],
-                'category': job['category'],
-                'skills': json.loads(job['skills']) if job['skills'] else [],
-                'url': job['url'],
-                'source': job['source'] if 'source' in job.keys() else 'seek',
-                'is_new_today': job['is_new_today'] if 'is_new_today' in job.keys() else 0,  # 新增字段
-                'created_at': job['created_at'],
-                'description': job['description'][:500] + '...' if job['description'] and len(job['description']) > 500 else job['description']
-            }
-            job_list.append(job_dict)
+        # Rows come in field order; zip drops the trailing search_rank
+        fields = JOB_LIST_FIELDS + ('snippet',) if match else JOB_LIST_FIELDS
+        loads = app.json.loads
         
-        conn.close()
+        def job_dict(job):
+            item = dict(zip(fields, job))
+            item['skills'] = loads(item['skills']) if item['skills'] else []
+            return item
         
-        return jsonify({
-            'jobs': job_list,
+        payload = {
             'total': total,
+            'total_is_estimate': total is not None and bool(match) and count_mode == 'estimate',
             'page': page,
             'per_page': per_page,
-            'total_pages': (total + per_page - 1) // per_page
-        })
+            'total_pages': (total + per_page - 1) // per_page if total is not None else None,
+            'next_cursor': encode_cursor(
+                [jobs[-1]['search_rank'], jobs[-1]['id']] if match else [jobs[-1]['id']]
+            ) if has_more else None
+        }
+        if len(jobs) > STREAM_MIN_JOBS:
+            # Rows are already fetched; only their encoding is spread over the response
+            return Response(stream_json(app, payload, 'jobs', map(job_dict, jobs)), mimetype='application/json')
+        return jsonify({'jobs': [job_dict(job) for job in jobs], **payload})
         
     except Exception as e:
         logger.error(f"Error getting jobs: {e}")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/jobs/<int:job_id>')
+@conditional(data_generation, data_modified_at)
 def get_job_detail(job_id):
     """Get full details of a specific job including complete description."""
     try:
         conn = get_db_connection()
         
         job = conn.execute("""
-            SELECT * FROM jobs WHERE id = ?
+            SELECT j.*, t.description AS full_description
+            FROM all_jobs j
+            LEFT JOIN job_description_text t ON t.job_id = j.id
+            WHERE j.id = ?
         """, (job_id,)).fetchone()
         
         if not job:
-            conn.close()
             return jsonify({'error': 'Job not found'}), 404
         
         job_dict = {
@@ -205,7 +263,7 @@ def get_job_detail(job_id):
             'skills': json.loads(job['skills']) if job['skills'] else [],
             'url': job['url'],
             'source': job['source'] if 'source' in job.keys() else 'seek',
-            'description': job['description'],  # Full description, not truncated
+            'description': job['full_description'],  # Full description, not truncated
             'first_seen_date': job['first_seen_date'],
             'last_seen_date': job['last_seen_date'],
             'is_active': job['is_active'],
@@ -213,8 +271,6 @@ def get_job_detail(job_id):
             'updated_at': job['updated_at']
         }
         
-        conn.close()
-        
         return jsonify(job_dict)
         
     except Exception as e:
@@ -222,6 +278,8 @@ def get_job_detail(job_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/categories')
+@conditional(data_generation, data_modified_at)
+@response_cache.cached(data_generation)
 def get_categories():
     """Get list of job categories."""
     try:
@@ -233,7 +291,6 @@ def get_categories():
         """).fetchall()
         
         category_list = [cat['category'] for cat in categories if cat['category']]
-        conn.close()
         
         return jsonify({'categories': category_list})
         
@@ -242,6 +299,8 @@ def get_categories():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/locations')
+@conditional(data_generation, data_modified_at)
+@response_cache.cached(data_generation)
 def get_locations():
     """Get list of job locations."""
     try:
@@ -253,7 +312,6 @@ def get_locations():
         """).fetchall()
         
         location_list = [loc['location'] for loc in locations if loc['location']]
-        conn.close()
         
         return jsonify({'locations': location_list})
         
@@ -262,57 +320,38 @@ def get_locations():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/stats')
+@conditional(data_generation, data_modified_at)
+@response_cache.cached(data_generation)
 def get_stats():
     """Get dashboard statistics."""
     try:
         conn = get_db_connection()
         
-        # Total active jobs
-        total_jobs = conn.execute("SELECT COUNT(*) FROM jobs WHERE is_active = 1").fetchone()[0]
-        
-        # Jobs by category
-        category_stats = conn.execute("""
-            SELECT category, COUNT(*) as count 
-            FROM jobs 
-            WHERE is_active = 1 
-            GROUP BY category 
+        # Active jobs per category, company and source (analytics rollups, database/rollups.py)
+        active_counts = """
+            SELECT value, active_count as count
+            FROM analytics_counts
+            WHERE dimension = ? AND active_count > 0
             ORDER BY count DESC
-        """).fetchall()
+        """
+        category_stats = conn.execute(active_counts, ('category',)).fetchall()
+        top_companies = conn.execute(active_counts + " LIMIT 10", ('company',)).fetchall()
+        source_stats = conn.execute(active_counts, ('source',)).fetchall()
+        total_jobs = sum(src['count'] for src in source_stats)
         
-        # Recent activity
+        # Recent activity: jobs first seen in the last 7 days
         recent_jobs = conn.execute("""
-            SELECT COUNT(*) 
-            FROM jobs 
-            WHERE created_at >= datetime('now', '-7 days')
+            SELECT COALESCE(SUM(count), 0)
+            FROM daily_source_counts 
+            WHERE day >= DATE('now', '-7 days')
         """).fetchone()[0]
         
-        # Top companies
-        top_companies = conn.execute("""
-            SELECT company, COUNT(*) as count 
-            FROM jobs 
-            WHERE is_active = 1 
-            GROUP BY company 
-            ORDER BY count DESC 
-            LIMIT 10
-        """).fetchall()
-        
-        # Jobs by source
-        source_stats = conn.execute("""
-            SELECT source, COUNT(*) as count 
-            FROM jobs 
-            WHERE is_active = 1 
-            GROUP BY source 
-            ORDER BY count DESC
-        """).fetchall()
-        
-        conn.close()
-        
         return jsonify({
             "total_jobs": total_jobs,
-            "category_stats": [{"category": cat['category'], "count": cat['count']} for cat in category_stats],
-            "source_stats": [{"source": src['source'], "count": src['count']} for src in source_stats],
+            "category_stats": [{"category": cat['value'], "count": cat['count']} for cat in category_stats],
+            "source_stats": [{"source": src['value'], "count": src['count']} for src in source_stats],
             "recent_jobs": recent_jobs,
-            "top_companies": [{"company": comp['company'], "count": comp['count']} for comp in top_companies]
+            "top_companies": [{"company": comp['value'], "count": comp['count']} for comp in top_companies]
         })
         
     except Exception as e:
@@ -416,11 +455,21 @@ def get_scrape_history():
                 'jobs_found': log['jobs_found'],
                 'jobs_new': log['jobs_new'],
                 'jobs_updated': log['jobs_updated'],
+                'jobs_removed': log['jobs_removed'],
                 'duration_seconds': log['duration_seconds'],
-                'error_message': log['error_message']
+                'error_message': log['error_message'],
+                'run_id': log['run_id'],
+                'pages': log['pages'],
+                'pages_per_second': log['pages_per_second'],
+                'phases': {
+                    'driver_startup': log['driver_startup_seconds'],
+                    'listing_pages': log['listing_seconds'],
+                    'detail_fetches': log['detail_seconds'],
+                    'parse': log['parse_seconds'],
+                    'db_write': log['db_write_seconds']
+                }
             })
         
-        conn.close()
         return jsonify({'history': history})
         
     except Exception as e:
@@ -428,47 +477,31 @@ def get_scrape_history():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/analytics/tech-stack')
+@conditional(data_generation, data_modified_at)
 def tech_stack_analytics():
     """Get tech stack analytics data."""
     try:
         conn = get_db_connection()
         
-        # 获取所有有tech_stack的职位
-        jobs = conn.execute("""
-            SELECT tech_stack 
-            FROM jobs 
-            WHERE tech_stack IS NOT NULL AND tech_stack != ''
-        """).fetchall()
-        
-        # 统计技术栈
-        from collections import Counter
-        tech_counter = {
-            'programming_languages': Counter(),
-            'frontend': Counter(),
-            'backend': Counter(),
-            'database': Counter(),
-            'cloud': Counter(),
-            'devops': Counter()
-        }
-        
-        for job in jobs:
-            try:
-                tech_data = json.loads(job['tech_stack'])
-                for category, skills in tech_data.items():
-                    if category in tech_counter:
-                        tech_counter[category].update(skills)
-            except:
-                continue
+        # 每个类别最常见的15项技术（job_tech 表，database/job_tech.py）
+        categories = ['programming_languages', 'frontend', 'backend', 'database', 'cloud', 'devops']
+        rows = conn.execute(f"""
+            SELECT category, tech, count FROM (
+                SELECT category, tech, COUNT(*) as count,
+                       ROW_NUMBER() OVER (PARTITION BY category ORDER BY COUNT(*) DESC, tech) as position
+                FROM job_tech
+                WHERE category IN ({', '.join('?' * len(categories))})
+                GROUP BY category, tech
+            )
+            WHERE position <= 15
+            ORDER BY category, position
+        """, categories).fetchall()
         
         # 转换为前端需要的格式
-        result = {}
-        for category, counter in tech_counter.items():
-            result[category] = [
-                {'name': skill, 'count': count}
-                for skill, count in counter.most_common(15)
-            ]
-        
-        conn.close()
+        result = {category: [] for category in categories}
+        for row in rows:
+            result[row['category']].append({'name': row['tech'], 'count': row['count']})
+        
         return jsonify(result)
         
     except Exception as e:
@@ -476,21 +509,17 @@ def tech_stack_analytics():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/analytics/trends')
+@conditional(data_generation, data_modified_at)
 def trends_analytics():
     """Get job posting trends over time."""
     try:
         conn = get_db_connection()
         
-        # 获取每日新增职位数
+        # 获取每日新增职位数（预聚合表）
         daily_jobs = conn.execute("""
-            SELECT 
-                DATE(first_seen_date) as date,
-                COUNT(*) as count,
-                source
-            FROM jobs
-            WHERE first_seen_date IS NOT NULL
-            GROUP BY DATE(first_seen_date), source
-            ORDER BY date DESC
+            SELECT day as date, count, source
+            FROM daily_source_counts
+            ORDER BY day DESC, source
             LIMIT 90
         """).fetchall()
         
@@ -513,7 +542,6 @@ def trends_analytics():
             for date, counts in sorted(trends.items())
         ]
         
-        conn.close()
         return jsonify({'trends': result})
         
     except Exception as e:
@@ -521,27 +549,24 @@ def trends_analytics():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/analytics/experience-levels')
+@conditional(data_generation, data_modified_at)
 def experience_levels():
     """Get distribution of experience levels."""
     try:
         conn = get_db_connection()
         
         levels = conn.execute("""
-            SELECT 
-                experience_level,
-                COUNT(*) as count
-            FROM jobs
-            WHERE experience_level IS NOT NULL
-            GROUP BY experience_level
+            SELECT value, total_count as count
+            FROM analytics_counts
+            WHERE dimension = 'experience_level' AND value IS NOT NULL
             ORDER BY count DESC
         """).fetchall()
         
         result = [
-            {'level': row['experience_level'], 'count': row['count']}
+            {'level': row['value'], 'count': row['count']}
             for row in levels
         ]
         
-        conn.close()
         return jsonify({'levels': result})
         
     except Exception as e:
@@ -549,33 +574,24 @@ def experience_levels():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/analytics/work-types')
+@conditional(data_generation, data_modified_at)
 def work_types():
     """Get distribution of work types (remote/hybrid/onsite)."""
     try:
         conn = get_db_connection()
         
-        jobs = conn.execute("""
-            SELECT work_type 
-            FROM jobs 
-            WHERE work_type IS NOT NULL AND work_type != '' AND work_type != '[]'
+        types = conn.execute("""
+            SELECT value, total_count as count
+            FROM analytics_counts
+            WHERE dimension = 'work_type'
+            ORDER BY count DESC
         """).fetchall()
         
-        from collections import Counter
-        type_counter = Counter()
-        
-        for job in jobs:
-            try:
-                types = json.loads(job['work_type'])
-                type_counter.update(types)
-            except:
-                continue
-        
         result = [
-            {'type': work_type, 'count': count}
-            for work_type, count in type_counter.most_common()
+            {'type': row['value'], 'count': row['count']}
+            for row in types
         ]
         
-        conn.close()
         return jsonify({'work_types': result})
         
     except Exception as e:
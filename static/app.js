@@ -1,6 +1,7 @@
 // Global variables
 let currentPage = 1;
 let currentFilters = {};
+let pageCursors = {};  // page number -> cursor returned with the previous page
 let categoryChart = null;
 
 // Initialize the application
@@ -179,11 +180,19 @@ async function loadFilters() {
 
 async function loadJobs(page = 1) {
     try {
+        if (page === 1) {
+            pageCursors = {};
+        }
+        
         const params = new URLSearchParams({
             page: page,
             per_page: 20,
             ...currentFilters
         });
+        // Pages reached with Next/Previous resume from a cursor instead of an offset
+        if (pageCursors[page]) {
+            params.set('cursor', pageCursors[page]);
+        }
         
         const response = await fetch(`/api/jobs?${params}`);
         const data = await response.json();
@@ -192,6 +201,10 @@ async function loadJobs(page = 1) {
             throw new Error(data.error);
         }
         
+        if (data.next_cursor) {
+            pageCursors[page + 1] = data.next_cursor;
+        }
+        
         displayJobs(data.jobs);
         updatePagination(data);
         
@@ -238,7 +251,11 @@ function displayJobs(jobs) {
                 ${job.job_type ? `<span>⏰ ${escapeHtml(job.job_type)}</span>` : ''}
             </div>
             
-            ${hasDescription ? `
+            ${job.snippet ? `
+                <div class="job-description-preview">
+                    ${highlightSnippet(job.snippet)}
+                </div>
+            ` : hasDescription ? `
                 <div class="job-description-preview">
                     ${escapeHtml(descriptionPreview)}${descriptionPreview.length >= 200 ? '...' : ''}
                 </div>
@@ -339,7 +356,9 @@ function closeJobModal() {
 
 function updatePagination(data) {
     const pagination = document.getElementById('pagination');
-    const totalPages = data.total_pages;
+    // Search totals are estimates; the next page exists exactly when there is a cursor to it
+    const hasNext = Boolean(data.next_cursor);
+    const totalPages = Math.max(data.total_pages || 0, hasNext ? currentPage + 1 : currentPage);
     
     if (totalPages <= 1) {
         pagination.innerHTML = '';
@@ -383,7 +402,7 @@ function updatePagination(data) {
     
     // Next button
     paginationHTML += `
-        <button class="page-btn" ${currentPage === totalPages ? 'disabled' : ''} onclick="changePage(${currentPage + 1})">
+        <button class="page-btn" ${hasNext ? '' : 'disabled'} onclick="changePage(${currentPage + 1})">
             Next
         </button>
     `;
@@ -540,6 +559,13 @@ function escapeHtml(text) {
     return div.innerHTML;
 }
 
+// Search snippets mark matched words with <mark>; everything else stays escaped
+function highlightSnippet(snippet) {
+    return escapeHtml(snippet)
+        .replace(/&lt;mark&gt;/g, '<mark>')
+        .replace(/&lt;\/mark&gt;/g, '</mark>');
+}
+
 function showError(message) {
     // Simple error display - could be enhanced with a proper notification system
     alert('Error: ' + message);
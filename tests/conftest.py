@@ -0,0 +1,67 @@
+import pytest
+
+from database.sqlite import connect
+from database.migrations import migrate
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of a database file in the test's temp directory (not created yet)."""
+    return str(tmp_path / 'job_scraper.db')
+
+
+@pytest.fixture
+def conn(db_path):
+    """Connection to a database migrated to the current schema."""
+    conn = connect(db_path)
+    migrate(conn)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Flask test client of simple_app serving a database in the test's temp directory."""
+    from config import Config
+    monkeypatch.setattr(Config, 'REDIS_URL', None)
+    # simple_app opens job_scraper.db relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    import simple_app
+    from database.counts import JobCounts
+
+    # Generations restart at 1 in every temp directory, so nothing may carry over
+    simple_app.response_cache.clear()
+    monkeypatch.setattr(simple_app, 'job_counts', JobCounts(simple_app.data_generation))
+    simple_app.init_database()
+    return simple_app.app.test_client()
+
+
+@pytest.fixture
+def publish_jobs(client):
+    """Returns add(jobs): stores (title, company, source, category) tuples as one finished
+    ingest run and publishes the read snapshot, like the scraper does."""
+    from database.rollups import refresh_rollups
+    from database.snapshot import publish_snapshot
+
+    def add(jobs):
+        conn = connect('job_scraper.db')
+        try:
+            run_id = conn.execute(
+                "INSERT INTO ingest_runs (started_at, finished_at) VALUES (datetime('now'), datetime('now'))"
+            ).lastrowid
+            start = conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+            conn.executemany('''
+                INSERT INTO jobs (external_id, title, company, source, category, url, first_seen_run_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (f'job-{start + i}', title, company, source, category,
+                 f'https://example.com/job/{start + i}', run_id)
+                for i, (title, company, source, category) in enumerate(jobs)
+            ])
+            conn.commit()
+            refresh_rollups(conn)
+        finally:
+            conn.close()
+        publish_snapshot('job_scraper.db')
+
+    return add
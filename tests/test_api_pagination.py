@@ -0,0 +1,70 @@
+"""Keyset cursor pagination of /api/jobs (simple_app.py)."""
+
+import pytest
+
+from simple_app import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor([42]), 1) == [42]
+    assert decode_cursor(encode_cursor([-3.25, 7]), 2) == [-3.25, 7]
+    assert '=' not in encode_cursor([1234567])
+
+
+@pytest.mark.parametrize('token, size', [
+    (encode_cursor([1, 2]), 1),       # search cursor on a plain listing
+    (encode_cursor(['1']), 1),        # only numbers are accepted
+    (encode_cursor({'id': 1}), 1),
+    ('not a cursor!', 1),
+    ('', 1),
+])
+def test_malformed_cursors_are_rejected(token, size):
+    with pytest.raises(ValueError):
+        decode_cursor(token, size)
+
+
+def walk(client, query):
+    """Ids of every page reached by following next_cursor."""
+    ids, cursor = [], None
+    while True:
+        url = query + (f'&cursor={cursor}' if cursor else '')
+        data = client.get(url).get_json()
+        ids.append([job['id'] for job in data['jobs']])
+        cursor = data['next_cursor']
+        if cursor is None:
+            return ids
+
+
+def offset_pages(client, query, pages):
+    return [[job['id'] for job in client.get(f'{query}&page={page}').get_json()['jobs']]
+            for page in range(1, pages + 1)]
+
+
+def test_cursor_pages_match_offset_pages(client, publish_jobs):
+    publish_jobs([(f'Engineer {i}', 'Acme', 'seek' if i % 2 else 'linkedin', 'IT') for i in range(25)])
+
+    pages = walk(client, '/api/jobs?per_page=10')
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert pages == offset_pages(client, '/api/jobs?per_page=10', 3)
+    assert sum(pages, []) == list(range(25, 0, -1))
+
+    # Filters seek through the same cursor
+    seek_pages = walk(client, '/api/jobs?per_page=5&source=seek')
+    assert sum(seek_pages, []) == [job_id for job_id in range(25, 0, -1) if job_id % 2 == 0]
+
+
+def test_search_cursor_follows_rank_order(client, publish_jobs):
+    publish_jobs([('Python Developer', 'Acme', 'seek', 'IT')] * 7
+                 + [('Python Python Engineer', 'Globex', 'seek', 'IT')] * 4
+                 + [('Java Developer', 'Initech', 'seek', 'IT')] * 5)
+
+    pages = walk(client, '/api/jobs?per_page=4&search=python')
+    assert pages == offset_pages(client, '/api/jobs?per_page=4&search=python', 3)
+    assert sorted(sum(pages, [])) == list(range(1, 12))
+
+
+def test_invalid_cursor_is_a_client_error(client, publish_jobs):
+    publish_jobs([('Engineer', 'Acme', 'seek', 'IT')])
+    response = client.get('/api/jobs?cursor=bogus')
+    assert response.status_code == 400
+    assert client.get(f'/api/jobs?search=engineer&cursor={encode_cursor([1])}').status_code == 400
@@ -0,0 +1,42 @@
+"""ETag/Last-Modified validators and 304 responses (response_cache.conditional)."""
+
+from email.utils import format_datetime
+
+
+def test_unchanged_data_revalidates_with_304(client, publish_jobs):
+    publish_jobs([('Engineer', 'Acme', 'seek', 'IT')])
+
+    response = client.get('/api/jobs?per_page=5')
+    assert response.status_code == 200
+    etag, weak = response.get_etag()
+    assert weak and response.headers['Cache-Control'] == 'no-cache'
+    assert response.last_modified is not None
+
+    revalidated = client.get('/api/jobs?per_page=5', headers={'If-None-Match': f'W/"{etag}"'})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+    assert revalidated.get_etag() == (etag, True)
+
+    since = format_datetime(response.last_modified, usegmt=True)
+    assert client.get('/api/jobs?per_page=5', headers={'If-Modified-Since': since}).status_code == 304
+
+    # Other query arguments are another representation
+    other = client.get('/api/jobs?per_page=6', headers={'If-None-Match': f'W/"{etag}"'})
+    assert other.status_code == 200 and other.get_etag()[0] != etag
+
+
+def test_publishing_changes_the_etag(client, publish_jobs):
+    publish_jobs([('Engineer', 'Acme', 'seek', 'IT')])
+    etag = client.get('/api/stats').get_etag()[0]
+
+    publish_jobs([('Analyst', 'Globex', 'linkedin', 'Finance')])
+    response = client.get('/api/stats', headers={'If-None-Match': f'W/"{etag}"'})
+    assert response.status_code == 200
+    assert response.get_etag()[0] != etag
+    assert response.get_json()['total_jobs'] == 2
+
+
+def test_errors_carry_no_validators(client):
+    response = client.get('/api/jobs?cursor=bogus')
+    assert response.status_code == 400
+    assert 'ETag' not in response.headers
@@ -0,0 +1,66 @@
+"""Listing totals and count modes of /api/jobs (database/counts.py)."""
+
+from database.sqlite import connect
+from database.snapshot import publish_snapshot
+from database.counts import JobCounts
+
+JOBS = ([('Python Developer', 'Acme', 'seek', 'IT')] * 7
+        + [('Python Engineer', 'Globex', 'linkedin', 'IT')] * 4
+        + [('Java Developer', 'Initech', 'seek', 'Finance')] * 5)
+
+
+def test_exact_counts_are_cached_per_generation(conn):
+    generation = [1]
+    counts = JobCounts(lambda: generation[0], max_entries=2)
+    conn.execute("INSERT INTO jobs (external_id, title, company, source) VALUES ('a', 'Dev', 'Acme', 'seek')")
+    assert counts.exact(conn, "source = ?", ['seek']) == 1
+
+    conn.execute("INSERT INTO jobs (external_id, title, company, source) VALUES ('b', 'Dev', 'Acme', 'seek')")
+    assert counts.exact(conn, "source = ?", ['seek']) == 1  # served from the cache
+
+    generation[0] += 1
+    assert counts.exact(conn, "source = ?", ['seek']) == 2
+
+    # Least recently used filter combinations are dropped
+    counts.exact(conn, "source = ?", ['linkedin'])
+    counts.exact(conn, "1", [])
+    assert len(counts._cache) == 2 and ("source = ?", ('seek',), None) not in counts._cache
+
+
+def test_count_modes(client, publish_jobs):
+    publish_jobs(JOBS)
+
+    data = client.get('/api/jobs?per_page=5').get_json()
+    assert (data['total'], data['total_pages'], data['total_is_estimate']) == (16, 4, False)
+    assert client.get('/api/jobs?category=Finance').get_json()['total'] == 5
+
+    data = client.get('/api/jobs?count=none').get_json()
+    assert (data['total'], data['total_pages']) == (None, None)
+    assert len(data['jobs']) == 16
+
+    # Searches estimate by default: 16 jobs x 11/16 with "python" x 12/16 with "developer"
+    data = client.get('/api/jobs?search=python+developer').get_json()
+    assert (data['total'], data['total_is_estimate']) == (8, True)
+    data = client.get('/api/jobs?search=python+developer&count=exact').get_json()
+    assert (data['total'], data['total_is_estimate']) == (7, False)
+
+    assert client.get('/api/jobs?count=maybe').status_code == 400
+
+
+def test_totals_follow_published_data(client, publish_jobs):
+    publish_jobs(JOBS)
+    assert client.get('/api/jobs?source=seek').get_json()['total'] == 12
+
+    publish_jobs([('Go Developer', 'Hooli', 'seek', 'IT')] * 3)
+    assert client.get('/api/jobs?source=seek').get_json()['total'] == 15
+    assert client.get('/api/jobs?search=developer&count=exact').get_json()['total'] == 15
+
+    # Enrichment and description fetches publish without a new ingest run
+    conn = connect('job_scraper.db')
+    try:
+        conn.execute("UPDATE jobs SET is_active = 0 WHERE company = 'Hooli'")
+        conn.commit()
+    finally:
+        conn.close()
+    publish_snapshot('job_scraper.db')
+    assert client.get('/api/jobs?source=seek').get_json()['total'] == 12
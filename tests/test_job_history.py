@@ -0,0 +1,49 @@
+"""Delta-encoded job history (database/job_history.py)."""
+
+from database.job_history import (
+    KEYFRAME_INTERVAL, TRACKED_FIELDS, diff_fields, reconstruct_job, write_snapshots
+)
+
+
+def test_diff_ignores_fields_that_were_not_scraped():
+    old = {'title': 'Engineer', 'salary_range': '$100k', 'location': 'Auckland'}
+    new = {'title': 'Senior Engineer', 'salary_range': '', 'location': None, 'url': 'https://x'}
+    assert diff_fields(old, new) == {'title': ['Engineer', 'Senior Engineer']}
+
+
+def test_every_version_is_reconstructed_across_keyframes(conn):
+    conn.execute("INSERT INTO jobs (external_id, title, company) VALUES ('h1', 'Engineer', 'Acme')")
+    job_id = 1
+    stored = dict.fromkeys(TRACKED_FIELDS)
+    stored.update(title='Engineer', company='Acme', salary_range='$90k')
+    original = dict(stored)
+
+    versions = []
+    for i in range(1, 2 * KEYFRAME_INTERVAL + 5):
+        scraped = {'salary_range': f'${90 + i}k'}
+        if i % 3 == 0:
+            scraped['title'] = f'Engineer v{i}'
+        changes = diff_fields(stored, scraped)
+        date = f'2025-01-{i:02d}T12:00:00'
+        assert write_snapshots(conn.cursor(), [(job_id, stored, changes)], date) == 1
+        stored = {**stored, **scraped}
+        versions.append((date, dict(stored)))
+    conn.commit()
+
+    keyframes = conn.execute(
+        'SELECT COUNT(*) FROM job_snapshots WHERE snapshot_data IS NOT NULL'
+    ).fetchone()[0]
+    assert keyframes == 1 + (len(versions) - 1) // KEYFRAME_INTERVAL
+
+    for date, expected in versions:
+        assert reconstruct_job(conn, job_id, date) == expected
+        # Between two changes the earlier version still applies
+        assert reconstruct_job(conn, job_id, date.replace('T12', 'T18')) == expected
+
+    assert reconstruct_job(conn, job_id) == versions[-1][1]
+    assert reconstruct_job(conn, job_id, '2024-12-31T00:00:00') == original
+
+
+def test_unchanged_jobs_write_nothing(conn):
+    assert write_snapshots(conn.cursor(), [(1, {'title': 'Engineer'}, {})], '2025-01-01') == 0
+    assert reconstruct_job(conn, 1) is None
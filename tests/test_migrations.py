@@ -0,0 +1,114 @@
+"""Versioned schema migrations (database/migrations.py)."""
+
+import json
+
+from database.sqlite import connect
+from database.migrations import MIGRATIONS, SCHEMA_VERSION, get_version, migrate
+
+# jobs as the code before versioned migrations built it: descriptions inline, no
+# canonical URL, columns patched on by fix_database_columns.py and the enrichment
+LEGACY_JOBS_TABLE = '''
+    CREATE TABLE jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        external_id TEXT UNIQUE,
+        title TEXT NOT NULL,
+        company TEXT NOT NULL,
+        location TEXT,
+        salary_range TEXT,
+        job_type TEXT,
+        description TEXT,
+        url TEXT UNIQUE,
+        category TEXT,
+        skills TEXT,
+        first_seen_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_seen_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        is_active BOOLEAN DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        source TEXT DEFAULT 'seek',
+        is_new_today BOOLEAN DEFAULT 0,
+        tech_stack TEXT
+    )
+'''
+
+
+def legacy_database(db_path):
+    conn = connect(db_path)
+    conn.execute(LEGACY_JOBS_TABLE)
+    conn.executemany('''
+        INSERT INTO jobs (external_id, title, company, description, url, source, tech_stack)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', [
+        ('81234567', 'Platform Engineer', 'Acme', 'Run Kubernetes clusters for Acme.',
+         'https://www.seek.co.nz/job/81234567?type=standard', 'seek',
+         json.dumps({'devops': ['Kubernetes', 'Terraform'], 'languages': ['Go']})),
+        # The old prefix matching stored the same posting twice
+        ('81234567-dup', 'Platform Engineer', 'Acme', None,
+         'https://www.seek.co.nz/job/81234567?ref=recommended', 'seek', '{not json'),
+        ('linkedin_3901234567', 'Data Analyst', 'Globex', '',
+         'https://nz.linkedin.com/jobs/view/data-analyst-at-globex-3901234567', 'linkedin', None),
+    ])
+    conn.commit()
+    return conn
+
+
+def test_fresh_database_applies_every_step_once(db_path):
+    conn = connect(db_path)
+    try:
+        assert migrate(conn) == [version for version, _, _ in MIGRATIONS]
+        assert get_version(conn) == SCHEMA_VERSION
+        assert migrate(conn) == []
+    finally:
+        conn.close()
+
+
+def test_versions_are_sequential():
+    assert [version for version, _, _ in MIGRATIONS] == list(range(1, SCHEMA_VERSION + 1))
+
+
+def test_legacy_database_is_upgraded_and_backfilled(db_path):
+    conn = legacy_database(db_path)
+    try:
+        assert get_version(conn) == 0
+        migrate(conn)
+        assert get_version(conn) == SCHEMA_VERSION
+
+        # Canonical URLs: the duplicate is retired instead of breaking the unique index
+        rows = conn.execute('SELECT external_id, canonical_url, is_active FROM jobs ORDER BY id').fetchall()
+        assert rows == [
+            ('81234567', 'https://www.seek.co.nz/job/81234567', 1),
+            ('81234567-dup', None, 0),
+            ('linkedin_3901234567', 'https://www.linkedin.com/jobs/view/3901234567', 1),
+        ]
+
+        # Descriptions moved to the compressed side table
+        assert conn.execute('SELECT COUNT(*) FROM jobs WHERE description IS NOT NULL').fetchone()[0] == 0
+        assert conn.execute('SELECT job_id, description FROM job_description_text').fetchall() == [
+            (1, 'Run Kubernetes clusters for Acme.')
+        ]
+        assert conn.execute('SELECT description_preview FROM jobs WHERE id = 1').fetchone()[0] \
+            == 'Run Kubernetes clusters for Acme.'
+
+        # Search index built over titles and the moved descriptions
+        assert conn.execute("SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH 'kubernetes'").fetchall() == [(1,)]
+        assert conn.execute("SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH 'analyst'").fetchall() == [(3,)]
+
+        assert conn.execute('SELECT COUNT(*) FROM all_jobs').fetchone()[0] == 3
+
+        # Rollups and tech rows are derived from the existing rows; malformed JSON is skipped
+        assert conn.execute('SELECT job_id, category, tech FROM job_tech ORDER BY tech').fetchall() == [
+            (1, 'languages', 'Go'), (1, 'devops', 'Kubernetes'), (1, 'devops', 'Terraform'),
+        ]
+        assert dict(conn.execute('''
+            SELECT value, active_count FROM analytics_counts WHERE dimension = 'source'
+        ''').fetchall()) == {'seek': 1, 'linkedin': 1}
+
+        assert migrate(conn) == []
+    finally:
+        conn.close()
+
+
+def test_new_jobs_are_indexed_by_triggers(conn):
+    conn.execute("INSERT INTO jobs (external_id, title, company) VALUES ('x1', 'Rust Developer', 'Initech')")
+    conn.commit()
+    assert conn.execute("SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH 'rust'").fetchall() == [(1,)]
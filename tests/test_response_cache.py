@@ -0,0 +1,42 @@
+"""Per-generation response cache and the data generation counter."""
+
+from database.generation import REDIS_KEY, bump_generation, current_generation
+from response_cache import FakeRedis, ResponseCache
+
+
+def test_cached_responses_are_replaced_after_a_publish(client, publish_jobs):
+    import simple_app
+
+    publish_jobs([('Engineer', 'Acme', 'seek', 'IT')])
+    assert client.get('/api/categories').get_json() == {'categories': ['IT']}
+    hits = simple_app.response_cache.hits
+    assert client.get('/api/categories').get_json() == {'categories': ['IT']}
+    assert simple_app.response_cache.hits == hits + 1
+
+    publish_jobs([('Analyst', 'Globex', 'linkedin', 'Finance')])
+    assert sorted(client.get('/api/categories').get_json()['categories']) == ['Finance', 'IT']
+
+
+def test_redis_tier_is_shared_between_workers():
+    shared = FakeRedis()
+    first, second = ResponseCache(shared), ResponseCache(shared)
+    first.set('3:/api/stats?', b'{"total_jobs":1}', 'application/json')
+    assert second.get('3:/api/stats?') == (b'{"total_jobs":1}', 'application/json')
+    assert second.get('4:/api/stats?') is None
+
+
+def test_local_tier_is_bounded():
+    cache = ResponseCache(max_entries=2)
+    for key in ('a', 'b', 'c'):
+        cache.set(key, b'{}', 'application/json')
+    assert cache.get('a') is None and cache.get('c') is not None
+
+
+def test_generation_never_goes_back_when_redis_loses_its_key(db_path):
+    redis_client = FakeRedis()
+    assert [bump_generation(db_path, redis_client) for _ in range(3)] == [1, 2, 3]
+
+    redis_client.delete(REDIS_KEY)
+    assert bump_generation(db_path, redis_client) == 4
+    assert current_generation(db_path, redis_client) == 4
+    assert bump_generation(db_path, redis_client) == 5
@@ -0,0 +1,53 @@
+"""Canonical URLs and stable external ids (scrapers/url_canonical.py)."""
+
+import pytest
+
+from scrapers.url_canonical import canonicalize_url, source_job_id, stable_job_id
+
+
+@pytest.mark.parametrize('source, urls, canonical', [
+    ('seek', [
+        'https://www.seek.co.nz/job/81234567',
+        'https://www.seek.co.nz/job/81234567?type=standard&ref=search-standalone#sol=abc',
+        'https://www.seek.co.nz/job/81234567/',
+    ], 'https://www.seek.co.nz/job/81234567'),
+    ('linkedin', [
+        'https://www.linkedin.com/jobs/view/3901234567',
+        'https://nz.linkedin.com/jobs/view/software-engineer-at-acme-3901234567?trk=public_jobs',
+    ], 'https://www.linkedin.com/jobs/view/3901234567'),
+    ('indeed', [
+        'https://nz.indeed.com/viewjob?jk=a1b2c3d4e5f6',
+        'https://nz.indeed.com/rc/clk?from=serp&jk=a1b2c3d4e5f6&vjs=3',
+    ], 'https://nz.indeed.com/viewjob?jk=a1b2c3d4e5f6'),
+    ('trademe', [
+        'https://www.trademe.co.nz/a/jobs/it/programming/auckland/listing/4512345678?rsqid=xyz',
+    ], 'https://www.trademe.co.nz/a/jobs/listing/4512345678'),
+])
+def test_variants_share_one_canonical_url(source, urls, canonical):
+    assert {canonicalize_url(url, source) for url in urls} == {canonical}
+
+
+def test_stable_ids_use_native_id_and_source_prefix():
+    assert stable_job_id('https://www.seek.co.nz/job/81234567?ref=x', 'seek') == '81234567'
+    assert stable_job_id('https://nz.linkedin.com/jobs/view/dev-at-acme-3901234567', 'linkedin') == 'linkedin_3901234567'
+    assert stable_job_id('https://nz.indeed.com/rc/clk?jk=a1b2c3&from=serp', 'indeed') == 'indeed_a1b2c3'
+
+
+def test_generic_rule_for_urls_without_a_native_id():
+    url = 'HTTPS://Example.COM/careers/backend-dev/?utm_source=feed#apply'
+    assert source_job_id(url, 'seek') is None
+    assert canonicalize_url(url, 'seek') == 'https://example.com/careers/backend-dev'
+    assert canonicalize_url(url) == canonicalize_url('https://example.com/careers/backend-dev')
+
+
+def test_hashed_ids_are_deterministic_and_ignore_tracking():
+    first = stable_job_id('https://example.com/careers/backend-dev?utm_source=feed', 'acme')
+    second = stable_job_id('https://example.com/careers/backend-dev/', 'acme')
+    assert first == second
+    assert first.startswith('acme_') and len(first) == len('acme_') + 16
+    assert stable_job_id('https://example.com/careers/frontend-dev', 'acme') != first
+
+
+def test_empty_url():
+    assert canonicalize_url('', 'seek') is None
+    assert canonicalize_url(None) is None
@@ -4,7 +4,7 @@ from typing import Dict, List, Optional, Any
 from config import Config
 import openai
 from sqlalchemy import text
-from database.connection import get_session
+from database.connection import session_scope
 from database.models import Job, ScrapeLog
 
 logger = logging.getLogger(__name__)
@@ -110,9 +110,9 @@ Generate the SQL query:
         """Get database schema information for LLM."""
         return """
 Tables:
-1. jobs (id, external_id, title, company, location, salary_range, job_type, description, url, category, skills, first_seen_date, last_seen_date, is_active, created_at, updated_at)
+1. jobs (id, external_id, title, company, location, salary_range, job_type, description_preview, url, category, skills, source, first_seen_date, last_seen_date, is_active, created_at, updated_at)
 2. job_snapshots (id, job_id, snapshot_date, field_changes, snapshot_data)
-3. scrape_logs (id, source, timestamp, jobs_found, jobs_new, jobs_updated, jobs_removed, status, error_message, duration_seconds)
+3. scrape_logs (id, source, timestamp, jobs_found, jobs_new, jobs_updated, jobs_removed, status, error_message, duration_seconds, run_id, pages, pages_per_second, driver_startup_seconds, listing_seconds, detail_seconds, parse_seconds, db_write_seconds)
 
 Common query patterns:
 - Count jobs by category: SELECT category, COUNT(*) FROM jobs WHERE is_active = true GROUP BY category
@@ -124,29 +124,29 @@ Common query patterns:
     def _execute_safe_query(self, sql_query: str) -> List[Dict]:
         """Execute SQL query safely and return results."""
         try:
-            session = get_session()
-            
-            # Execute query
-            result = session.execute(text(sql_query))
-            
-            # Convert to list of dictionaries
-            columns = result.keys()
-            rows = []
-            
-            for row in result:
-                row_dict = {}
-                for i, column in enumerate(columns):
-                    value = row[i]
-                    # Handle datetime objects
-                    if hasattr(value, 'isoformat'):
-                        value = value.isoformat()
-                    # Handle JSON objects
-                    elif isinstance(value, dict):
-                        value = json.dumps(value)
-                    row_dict[column] = value
-                rows.append(row_dict)
-            
-            session.close()
+            # The thread's session is shared: a failing query must not leave it
+            # in an aborted transaction, so it is always rolled back and closed
+            with session_scope() as session:
+                # Execute query
+                result = session.execute(text(sql_query))
+                
+                # Convert to list of dictionaries
+                columns = result.keys()
+                rows = []
+                
+                for row in result:
+                    row_dict = {}
+                    for i, column in enumerate(columns):
+                        value = row[i]
+                        # Handle datetime objects
+                        if hasattr(value, 'isoformat'):
+                            value = value.isoformat()
+                        # Handle JSON objects
+                        elif isinstance(value, dict):
+                            value = json.dumps(value)
+                        row_dict[column] = value
+                    rows.append(row_dict)
+            
             return rows
             
         except Exception as e:
@@ -194,21 +194,18 @@ Response:
     def get_dashboard_stats(self) -> Dict[str, Any]:
         """Get key statistics for dashboard display."""
         try:
-            session = get_session()
-            
-            # Total active jobs
-            total_jobs = session.query(Job).filter(Job.is_active == True).count()
-            
-            # Jobs by category
-            category_stats = session.query(Job.category, session.query(Job).filter(Job.category == Job.category, Job.is_active == True).count().label('count')).filter(Job.is_active == True).group_by(Job.category).all()
-            
-            # Recent activity
-            recent_jobs = session.query(Job).filter(Job.created_at >= text("NOW() - INTERVAL '7 days'")).count()
-            
-            # Top companies
-            top_companies = session.query(Job.company, session.query(Job).filter(Job.company == Job.company, Job.is_active == True).count().label('count')).filter(Job.is_active == True).group_by(Job.company).order_by(text('count DESC')).limit(10).all()
-            
-            session.close()
+            with session_scope() as session:
+                # Total active jobs
+                total_jobs = session.query(Job).filter(Job.is_active == True).count()
+                
+                # Jobs by category
+                category_stats = session.query(Job.category, session.query(Job).filter(Job.category == Job.category, Job.is_active == True).count().label('count')).filter(Job.is_active == True).group_by(Job.category).all()
+                
+                # Recent activity
+                recent_jobs = session.query(Job).filter(Job.created_at >= text("NOW() - INTERVAL '7 days'")).count()
+                
+                # Top companies
+                top_companies = session.query(Job.company, session.query(Job).filter(Job.company == Job.company, Job.is_active == True).count().label('count')).filter(Job.is_active == True).group_by(Job.company).order_by(text('count DESC')).limit(10).all()
             
             return {
                 "total_jobs": total_jobs,
@@ -4,7 +4,6 @@
 使用Plotly创建交互式图表
 """
 
-import sqlite3
 import json
 import pandas as pd
 from datetime import datetime, timedelta
@@ -12,13 +11,16 @@ from collections import Counter
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
+from database.sqlite import connect
+from database.snapshot import open_snapshot
 
 class JobMarketDashboard:
     """IT职位市场可视化仪表板"""
     
     def __init__(self, db_path='job_scraper.db'):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        # 优先读取只读快照，不与爬虫争用数据库
+        self.conn = open_snapshot(db_path) or connect(db_path)
     
     def load_data(self):
         """加载数据"""
@@ -29,8 +31,8 @@ class JobMarketDashboard:
             tech_stack, work_type, experience_level, benefits, skills_count,
             first_seen_date, last_seen_date,
             strftime('%Y-%m-%d', first_seen_date) as date
-        FROM jobs
-        WHERE description IS NOT NULL
+        FROM all_jobs
+        WHERE id IN (SELECT job_id FROM job_descriptions)
         """
         
         df = pd.read_sql_query(query, self.conn)